@@ -0,0 +1,60 @@
+'''
+Tests of the vorAirfoil camber lines against published mean-line values
+and thin airfoil theory. Run with: python -m pytest
+'''
+import math
+
+import pytest
+
+import vorAirfoil
+
+
+def _thinAirfoil(section, nChordwise=1000):
+    # Design CL (pi A1) and CM about c/4 (pi / 4 (A2 - A1)) of the piecewise
+    # linear camber line, from A_n = 2 / pi * int dz/dx cos(n theta) dtheta
+    xs, zs = vorAirfoil.camberTable(section, nChordwise=nChordwise)
+    a1 = a2 = 0.
+    for i in range(len(xs) - 1):
+        slope = (zs[i + 1] - zs[i]) / (xs[i + 1] - xs[i])
+        thetaA = math.acos(1 - 2 * xs[i])
+        thetaB = math.acos(1 - 2 * xs[i + 1])
+        a1 += 2 / math.pi * slope * (math.sin(thetaB) - math.sin(thetaA))
+        a2 += 2 / math.pi * slope * (math.sin(2 * thetaB) -
+                                     math.sin(2 * thetaA)) / 2
+    return math.pi * a1, math.pi / 4 * (a2 - a1)
+
+
+def test_naca4_camber():
+    xs, zs = vorAirfoil.camberTable('NACA2412')
+    # m / (1 - p)^2 * ((1 - 2p) + 2px - x^2) at x = 0.5
+    assert zs[xs.index(0.5)] == pytest.approx(0.02 / 0.36 * 0.35)
+    assert zs[0] == zs[-1] == 0.
+
+
+def test_naca5_standard_camber():
+    xs, zs = vorAirfoil.camberTable('NACA23012', nChordwise=400)
+    # 230 mean line: maximum camber at 15% chord, design CL 0.3
+    assert xs[zs.index(max(zs))] == pytest.approx(0.15, abs=0.002)
+    assert _thinAirfoil('NACA23012')[0] == pytest.approx(0.3, abs=0.003)
+
+
+def test_naca5_reflexed_camber():
+    # Reflexed 231 mean line: design CL 0.3 with (near) zero CM about c/4
+    cl, cm = _thinAirfoil('NACA23112')
+    assert cl == pytest.approx(0.3, abs=0.005)
+    assert abs(cm) < 0.003
+    assert abs(_thinAirfoil('NACA23012')[1]) > 0.01
+
+
+def test_nap_limit():
+    nap, text = vorAirfoil.napCards('NACA2412', 'NACA0012')
+    assert nap == 31 <= vorAirfoil.NAP_MAX
+    with pytest.raises(ValueError):
+        vorAirfoil.napCards('NACA2412', 'NACA0012', nChordwise=30)
+
+
+@pytest.mark.parametrize('section', ['NACA21112', 'NACA26012', 'NACA2X12',
+                                     'CLARKY'])
+def test_unknown_section(section):
+    with pytest.raises(ValueError):
+        vorAirfoil.camberTable(section)
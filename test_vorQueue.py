@@ -0,0 +1,72 @@
+'''
+Tests of the vorQueue claim, lease expiry and work stealing with several
+local worker processes. Run with: python -m pytest
+'''
+import json
+import os
+import time
+
+import vorArchive
+import vorModel
+import vorQueue
+
+
+def _cases(n):
+    return [{'inputGeo': dict(vorModel.inputGeo,
+                              xDistWingApexInIn=550 + i)}
+            for i in range(n)]
+
+
+def test_workers_finish_every_case_once(tmp_path):
+    queueDir = str(tmp_path / 'queue')
+    hashes = vorQueue.enqueue(queueDir, _cases(24))
+    nDone = vorQueue.spawnWorkers(queueDir, 4, prefetch=3)
+    assert sum(nDone) == 24
+    assert sorted(os.listdir(os.path.join(queueDir, 'done'))) == \
+        sorted(h + '.json' for h in hashes)
+    assert sorted(os.listdir(os.path.join(queueDir, 'results'))) == \
+        sorted(hashes)
+    for state in ('pending', 'claimed', 'failed', 'tmp'):
+        assert os.listdir(os.path.join(queueDir, state)) == []
+    assert vorQueue.status(queueDir) == {'pending': 0, 'reserved': 0,
+                                         'running': 0, 'done': 24,
+                                         'failed': 0}
+
+
+def test_requeue_expired_claim(tmp_path):
+    queueDir = str(tmp_path / 'queue')
+    vorQueue.initQueue(queueDir)
+    case = _cases(1)[0]
+    h = vorModel.caseHash(case)
+    stale = os.path.join(queueDir, 'claimed',
+                         h + '.deadhost-1.running.json')
+    with open(stale, 'w') as fout:
+        json.dump(case, fout)
+    live = os.path.join(queueDir, 'claimed',
+                        'f' * 40 + '.livehost-2.running.json')
+    with open(live, 'w') as fout:
+        json.dump(case, fout)
+    old = time.time() - 120
+    os.utime(stale, (old, old))
+    assert vorQueue.requeueExpired(queueDir, 60.) == 1
+    assert os.listdir(os.path.join(queueDir, 'pending')) == [h + '.json']
+    assert os.listdir(os.path.join(queueDir, 'claimed')) == \
+        [os.path.basename(live)]
+
+
+def test_archive_mode_leaves_no_case_files(tmp_path):
+    queueDir = str(tmp_path / 'queue')
+    archiveDir = str(tmp_path / 'archive')
+    hashes = vorQueue.enqueue(queueDir, _cases(12))
+    nDone = vorQueue.spawnWorkers(queueDir, 3, archiveDir=archiveDir)
+    assert sum(nDone) == 12
+    for state in vorQueue.STATES:
+        assert os.listdir(os.path.join(queueDir, state)) == []
+    index = vorArchive.ArchiveIndex(archiveDir)
+    assert len(index) == 12
+    for h in hashes:
+        assert index.fileNames(h) == ['case.json', 'vorlax.in']
+    # Archived cases count as done and are not queued again
+    assert vorQueue.status(queueDir, archiveDir)['done'] == 12
+    vorQueue.enqueue(queueDir, _cases(12), archiveDir)
+    assert os.listdir(os.path.join(queueDir, 'pending')) == []
@@ -0,0 +1,78 @@
+'''
+Tests of the vorSensitivity step selection, Jacobian assembly and exact
+geometry derivatives. Run with: python -m pytest
+'''
+import pytest
+
+import vorModel
+import vorSensitivity
+
+
+def cardSumSolve(deck):
+    # Stand-in for VORLAX: coefficients linear in the numbers on the
+    # non-comment cards, so every geometry card change shows up
+    total = sum(value for value, res in vorSensitivity._cardValues(deck))
+    return {(0.2, 0.0): {'CL': 1e-4 * total, 'CM': -2e-5 * total,
+                         'CDI': 1e-6 * total}}
+
+
+@pytest.fixture(scope='module')
+def jacobians():
+    return {method: vorSensitivity.sensitivities(
+                vorModel.inputGeo, cardSumSolve, method=method)
+            for method in ('central', 'forward')}
+
+
+@pytest.mark.parametrize('method', ['central', 'forward'])
+def test_default_design_steps(jacobians, method):
+    result = jacobians[method]
+    parameters = vorSensitivity.designParameters(vorModel.inputGeo)
+    assert result['parameters'] == parameters
+    assert len(result['jacobian']['CL'][0]) == len(parameters)
+    for parameter in parameters:
+        assert result['steps'][parameter] >= \
+            vorSensitivity.stepSize(vorModel.inputGeo, parameter)
+    # Comment-only input: zero derivative at the default step
+    i = parameters.index('mrpMacHTailPct')
+    assert result['jacobian']['CL'][0][i] == 0.
+    assert result['steps']['mrpMacHTailPct'] == 0.5
+
+
+def test_forward_steps_grow_to_card_resolution(jacobians):
+    steps = jacobians['forward']['steps']
+    for parameter in ('mrpMacPct', 'ratioCSta4OverCtrap',
+                      'ratioCSta6OverCtrap'):
+        assert steps[parameter] > \
+            vorSensitivity.stepSize(vorModel.inputGeo, parameter)
+
+
+def test_forward_matches_central(jacobians):
+    central = jacobians['central']['jacobian']['CL'][0]
+    forward = jacobians['forward']['jacobian']['CL'][0]
+    scale = max(abs(d) for d in central)
+    for parameter, dc, df in zip(jacobians['central']['parameters'],
+                                 central, forward):
+        assert df == pytest.approx(dc, abs=0.05 * scale), parameter
+
+
+def test_given_step_below_resolution_raises():
+    with pytest.raises(ValueError):
+        vorSensitivity.sensitivities(
+            vorModel.inputGeo, cardSumSolve,
+            parameters=['incidenceDegSta3'], steps={'incidenceDegSta3': 1e-5})
+
+
+def test_exact_geometry_derivatives():
+    inputGeo = vorModel.inputGeo
+    parameters = vorSensitivity.designParameters(inputGeo)
+    derivs = vorSensitivity.geometryDerivatives(inputGeo, parameters)
+    for j, parameter in enumerate(parameters):
+        h = 1e-4 * max(abs(inputGeo[parameter]), 1.)
+        plus = vorModel.deriveGeometry(
+            vorSensitivity._perturbed(inputGeo, parameter, h))
+        minus = vorModel.deriveGeometry(
+            vorSensitivity._perturbed(inputGeo, parameter, -h))
+        for quantity in vorSensitivity.GEOMETRY:
+            difference = (plus[quantity] - minus[quantity]) / (2 * h)
+            assert derivs[quantity][j] == pytest.approx(
+                difference, rel=1e-5, abs=1e-9), (quantity, parameter)
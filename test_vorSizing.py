@@ -0,0 +1,36 @@
+'''
+Tests of the vorSizing inverse solutions. Run with: python -m pytest
+'''
+import pytest
+
+import vorModel
+import vorSizing
+
+COMBINATIONS = [('xDistHTailApexInIn', 'hTailVolCoeff'),
+                ('sRefHTailInFt2', 'hTailVolCoeff'),
+                ('mrpMacPct', 'hTailVolCoeff'),
+                ('xDistVTailBaseInIn', 'vTailVolCoeff'),
+                ('sRefVTailInFt2', 'vTailVolCoeff'),
+                ('mrpMacPct', 'vTailVolCoeff'),
+                ('mrpMacPct', 'xMrpInIn'),
+                ('xDistHTailApexInIn', 'staticMargin'),
+                ('mrpMacPct', 'staticMargin')]
+
+
+def _designs():
+    return [dict(vorModel.inputGeo, arWing=ar, sRefHTailInFt2=sh)
+            for ar, sh in ((9.45, 348.74), (8., 300.), (11., 420.))]
+
+
+@pytest.mark.parametrize('unknown, target', COMBINATIONS)
+def test_solve_inverse_round_trip(unknown, target):
+    designs = _designs()
+    original = [dict(inputGeo) for inputGeo in designs]
+    targets = [1.1 * vorSizing.designQuantity(inputGeo, target)
+               for inputGeo in designs]
+    sized = vorSizing.solveInverse(designs, targets, unknown, target)
+    for design, value in zip(sized, targets):
+        assert vorSizing.designQuantity(design, target) == \
+            pytest.approx(value, rel=1e-9, abs=1e-12)
+    # Copies are returned, the designs are untouched
+    assert designs == original
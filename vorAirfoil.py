@@ -0,0 +1,172 @@
+'''
+VorAirfoil
+
+Camber lines of wing sections for the NAP camber cards of VORLAX panels.
+
+A section is given as one of:
+'NACA2412'                     NACA 4-digit camber line
+'NACA23012', 'NACA23112'       NACA 5-digit camber line (3rd digit 1 =
+                               reflexed)
+{'x': [...], 'z': [...]}       tabulated camber line, x and z as
+                               fractions of chord
+{'coordinates': [[x, y], ...]} tabulated airfoil surface (Selig order:
+                               upper TE -> LE -> lower TE), camber taken
+                               midway between upper and lower surface
+
+Camber is resampled to the chordwise stations VORLAX uses for its vortices
+and control points (LAX = 0 cosine law or LAX = 1 quarter-chord law, for
+RNCV chordwise vortices), plus the leading and trailing edge, so the
+solver interpolates nothing between the tabulated points. Tables are
+memoized by section, LAX and RNCV, so identical sections are computed
+once across panels and designs.
+
+napCards(rootSection, tipSection) returns NAP and the camber cards for
+one panel, in the layout described in the "vorModel" docstring.
+'''
+import bisect
+import functools
+import math
+
+# Standard (non-reflexed) NACA 5-digit mean lines: p -> (r, k1)
+_naca5Standard = {1: (0.0580, 361.400), 2: (0.1260, 51.640),
+                  3: (0.2025, 15.957), 4: (0.2900, 6.643),
+                  5: (0.3910, 3.230)}
+# Reflexed NACA 5-digit mean lines: p -> (r, k1, k2 / k1)
+_naca5Reflex = {2: (0.1300, 51.990, 0.000764),
+                3: (0.2170, 15.793, 0.00677),
+                4: (0.3180, 6.520, 0.0303),
+                5: (0.4410, 3.191, 0.1355)}
+
+# VORLAX limit on camber stations per panel
+NAP_MAX = 50
+
+
+def chordStations(lax=0, nChordwise=15):
+    """Return the x/c stations (fractions, ascending) of the vortices and
+    control points of nChordwise chordwise vortices, plus the LE and TE.
+
+    LAX = 0: vortices at 0.5 * (1 - cos((2K - 1) pi / 2N)), control points
+    at 0.5 * (1 - cos(K pi / N)); LAX = 1: vortices at (4K - 3) / 4N,
+    control points at (4K - 1) / 4N.
+    """
+    n = nChordwise
+    if lax == 0:
+        stations = [0.5 * (1 - math.cos((2 * k - 1) * math.pi / (2 * n)))
+                    for k in range(1, n + 1)] + \
+                   [0.5 * (1 - math.cos(k * math.pi / n))
+                    for k in range(1, n + 1)]
+    else:
+        stations = [(4 * k - 3) / (4 * n) for k in range(1, n + 1)] + \
+                   [(4 * k - 1) / (4 * n) for k in range(1, n + 1)]
+    return tuple(sorted(set([0.] + [round(x, 12) for x in stations] + [1.])))
+
+
+def _naca4(digits, xs):
+    m = int(digits[0]) / 100
+    p = int(digits[1]) / 10
+    if m == 0 or p == 0:
+        return [0.] * len(xs)
+    return [m / p**2 * (2 * p * x - x**2) if x < p else
+            m / (1 - p)**2 * ((1 - 2 * p) + 2 * p * x - x**2) for x in xs]
+
+
+def _naca5(digits, xs):
+    # Design lift coefficient scales the tabulated CL = 0.3 mean lines
+    scale = int(digits[0]) * 0.15 / 0.3
+    p, reflex = int(digits[1]), int(digits[2])
+    if reflex == 0:
+        r, k1 = _naca5Standard[p]
+        return [scale * k1 / 6 * (x**3 - 3 * r * x**2 + r**2 * (3 - r) * x)
+                if x < r else scale * k1 * r**3 / 6 * (1 - x) for x in xs]
+    r, k1, k21 = _naca5Reflex[p]
+    return [scale * k1 / 6 * ((x - r)**3 - k21 * (1 - r)**3 * x -
+                              r**3 * x + r**3) if x < r else
+            scale * k1 / 6 * (k21 * (x - r)**3 - k21 * (1 - r)**3 * x -
+                              r**3 * x + r**3) for x in xs]
+
+
+def _interpolate(xTable, zTable, xs):
+    # Linear interpolation, holding the end values outside the table
+    zs = []
+    for x in xs:
+        i = bisect.bisect_right(xTable, x)
+        if i == 0:
+            zs.append(zTable[0])
+        elif i == len(xTable):
+            zs.append(zTable[-1])
+        else:
+            t = (x - xTable[i - 1]) / (xTable[i] - xTable[i - 1])
+            zs.append(zTable[i - 1] + t * (zTable[i] - zTable[i - 1]))
+    return zs
+
+
+@functools.lru_cache(maxsize=256)
+def _camberFromCoordinates(coordinates):
+    # Split Selig ordered coordinates at the LE into upper and lower
+    # surfaces and average them on the union of their x values
+    iLe = min(range(len(coordinates)), key=lambda i: coordinates[i][0])
+    upper = sorted(coordinates[:iLe + 1])
+    lower = sorted(coordinates[iLe:])
+    xTable = sorted(set(x for x, y in coordinates))
+    zUpper = _interpolate([x for x, y in upper], [y for x, y in upper],
+                          xTable)
+    zLower = _interpolate([x for x, y in lower], [y for x, y in lower],
+                          xTable)
+    return tuple(xTable), tuple((u + l) / 2 for u, l in zip(zUpper, zLower))
+
+
+def sectionKey(section):
+    """Return a hashable form of a section (see module docstring)."""
+    if isinstance(section, str):
+        return section.replace(' ', '').upper()
+    if 'coordinates' in section:
+        return ('table',) + _camberFromCoordinates(
+            tuple(tuple(point) for point in section['coordinates']))
+    xs, zs = zip(*sorted(zip(section['x'], section['z'])))
+    return ('table', tuple(xs), tuple(zs))
+
+
+@functools.lru_cache(maxsize=1024)
+def _camberTable(key, lax, nChordwise):
+    xs = chordStations(lax, nChordwise)
+    if isinstance(key, tuple):
+        zs = _interpolate(key[1], key[2], xs)
+    elif key.startswith('NACA') and len(key) == 8 and key[4:].isdigit():
+        zs = _naca4(key[4:], xs)
+    elif key.startswith('NACA') and len(key) == 9 and key[4:].isdigit() \
+            and key[6] in '01' and int(key[5]) in \
+            (_naca5Reflex if key[6] == '1' else _naca5Standard):
+        zs = _naca5(key[4:], xs)
+    else:
+        raise ValueError('Unknown section: ' + str(key))
+    return xs, tuple(zs)
+
+
+def camberTable(section, lax=0, nChordwise=15):
+    """Return (x/c, z/c) tuples (fractions of chord) of the camber line of
+    section at the chordStations for lax and nChordwise."""
+    return _camberTable(sectionKey(section), lax, nChordwise)
+
+
+@functools.lru_cache(maxsize=1024)
+def _napCards(rootKey, tipKey, lax, nChordwise):
+    xs, zRoot = _camberTable(rootKey, lax, nChordwise)
+    zTip = _camberTable(tipKey, lax, nChordwise)[1]
+    if len(xs) > NAP_MAX:
+        raise ValueError('NAP = ' + str(len(xs)) + ' exceeds ' +
+                         str(NAP_MAX) + ', use fewer chordwise vortices')
+    text = '* CAMBER DEFINITION FOR ROOT AND TIP OF PANEL FOLLOWS\n'
+    text += '*% CHORD\n'
+    text += ''.join("{:10.4f}".format(100 * x) + '\n' for x in xs)
+    text += '*\n*% CAMBER - ROOT\n'
+    text += ''.join("{:10.4f}".format(100 * z) + '\n' for z in zRoot)
+    text += '*\n*% CAMBER - TIP\n'
+    text += ''.join("{:10.4f}".format(100 * z) + '\n' for z in zTip)
+    return len(xs), text
+
+
+def napCards(rootSection, tipSection, lax=0, nChordwise=15):
+    """Return (NAP, camber card text) for a panel with rootSection on its
+    first edge and tipSection on its second edge."""
+    return _napCards(sectionKey(rootSection), sectionKey(tipSection), lax,
+                     nChordwise)
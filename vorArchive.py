@@ -0,0 +1,227 @@
+'''
+VorArchive
+
+Archive-backed storage for VorModel decks and Vorlax outputs, so that a
+study of many cases is a handful of large files instead of one directory
+(and several tiny files) per case.
+
+Files of each case are appended to chunked zip shards (deflate
+compressed) as members named <hash>/<fileName>, where <hash> is
+vorModel.caseHash(case). Next to the shards, each writer keeps a sidecar
+index with one JSON line per member giving the shard and the byte offset
+of the member, so a file is read with one seek and one read, without
+scanning the shard's central directory:
+
+archiveDir/<writer>-0000.zip  shards, a new one every maxShardBytes
+archiveDir/<writer>-0001.zip
+archiveDir/<writer>.idx       sidecar index for this writer's shards
+
+Every writer (e.g. each vorQueue worker) has its own shards and index, so
+several processes or nodes can write to one archive directory at once.
+Index lines are only written after the member data is flushed, so a
+writer that dies leaves readable shards behind.
+
+Runners extract a case into a scratch directory only when it is run:
+index = ArchiveIndex(archiveDir)
+extractCase(index, h, scratchDir)
+'''
+import glob
+import json
+import os
+import struct
+import zipfile
+import zlib
+
+import vorModel
+
+# Fixed part of a zip local file header (see the zip APPNOTE, 4.3.7)
+_localHeader = struct.Struct('<4s5H3L2H')
+
+
+class ArchiveWriter:
+    """Append case files to zip shards and the writer's sidecar index."""
+
+    def __init__(self, archiveDir, writer='vor', maxShardBytes=2**28):
+        os.makedirs(archiveDir, exist_ok=True)
+        self.archiveDir = archiveDir
+        self.writer = writer
+        self.maxShardBytes = maxShardBytes
+        self.nShard = len(glob.glob(os.path.join(archiveDir,
+                                                 writer + '-*.zip')))
+        self.shardFile = None
+        self.zipFile = None
+        self.fidx = open(os.path.join(archiveDir, writer + '.idx'), 'a')
+
+    def _openShard(self):
+        self.shardName = self.writer + '-' + '{:04d}'.format(self.nShard) + \
+                         '.zip'
+        self.nShard += 1
+        self.shardFile = open(os.path.join(self.archiveDir, self.shardName),
+                              'wb')
+        self.zipFile = zipfile.ZipFile(self.shardFile, 'w',
+                                       zipfile.ZIP_DEFLATED)
+
+    def _closeShard(self):
+        if self.zipFile is not None:
+            self.zipFile.close()
+            self.shardFile.close()
+            self.zipFile = None
+            self.shardFile = None
+
+    def addCase(self, h, files):
+        """Store files ({fileName: bytes or str}) under case hash h."""
+        if self.zipFile is None or \
+           self.shardFile.tell() > self.maxShardBytes:
+            self._closeShard()
+            self._openShard()
+        entries = []
+        for fileName in sorted(files):
+            data = files[fileName]
+            if isinstance(data, str):
+                data = data.encode('utf-8')
+            self.zipFile.writestr(h + '/' + fileName, data)
+            info = self.zipFile.infolist()[-1]
+            entries.append({'hash': h, 'name': fileName,
+                            'shard': self.shardName,
+                            'offset': info.header_offset,
+                            'csize': info.compress_size,
+                            'size': info.file_size,
+                            'crc': info.CRC,
+                            'method': info.compress_type})
+        self.shardFile.flush()
+        for entry in entries:
+            self.fidx.write(json.dumps(entry, sort_keys=True) + '\n')
+        self.fidx.flush()
+
+    def addDir(self, h, caseDir):
+        """Store every file in caseDir under case hash h."""
+        files = {}
+        for fileName in sorted(os.listdir(caseDir)):
+            path = os.path.join(caseDir, fileName)
+            if os.path.isfile(path):
+                with open(path, 'rb') as fin:
+                    files[fileName] = fin.read()
+        self.addCase(h, files)
+
+    def close(self):
+        self._closeShard()
+        self.fidx.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _indexLines(idxPath, start=0):
+    # Yield (complete line, offset after it) of a sidecar index from byte
+    # offset start; a writer killed or still writing leaves a torn last
+    # line, which is left for the next read
+    with open(idxPath, 'rb') as fidx:
+        fidx.seek(start)
+        for line in fidx:
+            if not line.endswith(b'\n'):
+                return
+            start += len(line)
+            yield line, start
+
+
+def archivedHashes(archiveDir):
+    """Return the set of case hashes stored in archiveDir, reading only
+    the hash of each index line (cheaper than a full ArchiveIndex)."""
+    hashes = set()
+    for idxPath in glob.glob(os.path.join(archiveDir, '*.idx')):
+        for line, end in _indexLines(idxPath):
+            i = line.find(b'"hash": "')
+            if i >= 0:
+                hashes.add(line[i + 9:line.index(b'"', i + 9)].decode())
+    return hashes
+
+
+class ArchiveIndex:
+    """Merged sidecar indexes of an archive directory, keyed by case hash.
+
+    Each member is held as a compact (shard, offset, csize, crc, method)
+    tuple, and refresh only reads index lines added since the last read,
+    so one index can be kept and refreshed across calls.
+    """
+
+    def __init__(self, archiveDir):
+        self.archiveDir = archiveDir
+        self.cases = {}
+        self._shards = {}
+        self._ends = {}
+        self.refresh()
+
+    def refresh(self):
+        """Read index lines added since the last refresh (e.g. while
+        writers are active)."""
+        for idxPath in sorted(glob.glob(os.path.join(self.archiveDir,
+                                                     '*.idx'))):
+            for line, end in _indexLines(idxPath, self._ends.get(idxPath, 0)):
+                self._ends[idxPath] = end
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                # One shard name string shared by all its members
+                shard = self._shards.setdefault(entry['shard'],
+                                                entry['shard'])
+                self.cases.setdefault(entry['hash'], {})[entry['name']] = \
+                    (shard, entry['offset'], entry['csize'], entry['crc'],
+                     entry['method'])
+
+    def __contains__(self, h):
+        return h in self.cases
+
+    def __len__(self):
+        return len(self.cases)
+
+    def fileNames(self, h):
+        return sorted(self.cases[h])
+
+    def read(self, h, fileName):
+        """Return the contents (bytes) of fileName of case h."""
+        shard, offset, csize, crc, method = self.cases[h][fileName]
+        with open(os.path.join(self.archiveDir, shard), 'rb') as fin:
+            fin.seek(offset)
+            header = _localHeader.unpack(fin.read(_localHeader.size))
+            if header[0] != b'PK\x03\x04':
+                raise ValueError('Bad zip header for ' + h + '/' + fileName)
+            # Skip the member name and extra field
+            fin.seek(header[9] + header[10], os.SEEK_CUR)
+            data = fin.read(csize)
+        if method == zipfile.ZIP_DEFLATED:
+            data = zlib.decompressobj(-zlib.MAX_WBITS).decompress(data)
+        if zlib.crc32(data) != crc:
+            raise ValueError('CRC mismatch for ' + h + '/' + fileName)
+        return data
+
+
+def extractCase(index, h, scratchDir):
+    """Write all files of case h into scratchDir and return scratchDir."""
+    os.makedirs(scratchDir, exist_ok=True)
+    for fileName in index.fileNames(h):
+        with open(os.path.join(scratchDir, fileName), 'wb') as fout:
+            fout.write(index.read(h, fileName))
+    return scratchDir
+
+
+def archiveDecks(archiveDir, cases, writer='decks'):
+    """Store vorlax.in and case.json of each case in the archive.
+
+    cases are dicts holding an inputGeo dictionary, as for "vorQueue".
+    Returns the list of case hashes, in the order of cases.
+    """
+    hashes = []
+    with ArchiveWriter(archiveDir, writer) as archive:
+        for case in cases:
+            h = vorModel.caseHash(case)
+            deck = vorModel.vorlaxDeck(case['inputGeo'],
+                                       **case.get('conditions', {}))
+            archive.addCase(h, {'vorlax.in': deck,
+                                'case.json': json.dumps(case,
+                                                        sort_keys=True)})
+            hashes.append(h)
+    return hashes
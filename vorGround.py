@@ -0,0 +1,103 @@
+'''
+VorGround
+
+Ground-effect height sweeps for VorModel designs (takeoff and landing
+studies). VORLAX models the ground by the method of images when HAG, the
+height of the moment reference point above the ground, is nonzero; by
+default vorModel writes HAG = 0 (free air).
+
+heightSchedule gives heights spaced geometrically in h/b, so points are
+concentrated near the ground where the coefficients change fastest.
+groundEffectSweep writes one deck per design and height, each holding all
+the MACH and ALPHA cards, solves the whole set as one parallel batch and
+returns the coefficients as height-indexed arrays. Only the header card
+differs between the decks of a design; the echo and geometry cards come
+from the vorModel card cache.
+
+The solver is supplied by the caller, as for "vorSampling": a module
+level solveDeck(deckText) returning {(mach, alpha): {'CL': ..., ...}}.
+'''
+import math
+
+import vorModel
+import vorSampling
+
+
+def heightSchedule(inputGeo, hOverBMin=0.05, hOverBMax=2., nHeight=8,
+                   freeAir=True):
+    """Return HAG values (in) for inputGeo, spaced geometrically in height
+    over wing span from hOverBMin to hOverBMax. With freeAir, a final 0
+    (no ground effect) is appended as the out-of-ground-effect reference.
+
+    hOverBMin is raised, if needed, so the lowest panel stays at least
+    vorModel.GROUND_CLEARANCE above the ground (see
+    vorModel.checkGroundHeights).
+    """
+    geo = vorModel.deriveGeometry(inputGeo)
+    bInIn = geo['bInIn']
+    hLowest = vorModel.minGroundHeight(inputGeo, geo) + \
+              vorModel.GROUND_CLEARANCE
+    hOverBMin = max(hOverBMin, hLowest / bInIn)
+    if hOverBMin >= hOverBMax:
+        raise ValueError('Geometry reaches ' + "{:.2f}".format(hLowest) +
+                         ' in below the MRP, above hOverBMax * b')
+    if nHeight == 1:
+        heights = [hOverBMin * bInIn]
+    else:
+        ratio = (hOverBMax / hOverBMin)**(1 / (nHeight - 1))
+        heights = [hOverBMin * ratio**k * bInIn for k in range(nHeight)]
+    # Round up, so rounding never takes the lowest height below hLowest
+    heights = [math.ceil(h * 10**vorSampling.DIGITS['hag']) /
+               10**vorSampling.DIGITS['hag'] for h in heights]
+    if freeAir:
+        heights.append(0.)
+    return heights
+
+
+def groundEffectSweep(designs, solveDeck, alpha, mach=(0.2,),
+                      heights=None, coefficients=('CL', 'CM'), nProc=1):
+    """Solve each design (inputGeo dict) at each height for all alpha and
+    mach values.
+
+    heights is a list of HAG values (in) used for every design; by default
+    each design gets heightSchedule(design). Heights rejected by
+    vorModel.checkGroundHeights (negative, or too close to the ground for
+    a design) raise ValueError. All decks are solved as
+    one batch over nProc processes.
+
+    Returns one dict per design with 'hag' (heights), 'hOverB' (inf for
+    the free-air HAG 0), 'mach', 'alpha' and, for each coefficient, a
+    nested list indexed [iHeight][iMach][iAlpha].
+    """
+    mach = [round(m, vorSampling.DIGITS['mach']) for m in mach]
+    alpha = [round(a, vorSampling.DIGITS['alpha']) for a in alpha]
+    schedules = []
+    decks = []
+    for inputGeo in designs:
+        if heights is None:
+            schedule = heightSchedule(inputGeo)
+        else:
+            schedule = [round(h, vorSampling.DIGITS['hag']) for h in heights]
+            vorModel.checkGroundHeights(inputGeo, schedule)
+        schedules.append(schedule)
+        decks += [vorModel.vorlaxDeck(inputGeo, mach=mach, alpha=alpha,
+                                      hag=h) for h in schedule]
+    solved = vorSampling.solveDecks(decks, solveDeck, nProc)
+    sweeps = []
+    iDeck = 0
+    for inputGeo, schedule in zip(designs, schedules):
+        bInIn = vorModel.deriveGeometry(inputGeo)['bInIn']
+        # HAG 0 is free air, infinitely far from the ground
+        sweep = {'hag': schedule,
+                 'hOverB': [h / bInIn if h > 0 else float('inf')
+                            for h in schedule],
+                 'mach': mach, 'alpha': alpha}
+        for coef in coefficients:
+            sweep[coef] = []
+        for h in schedule:
+            for coef in coefficients:
+                sweep[coef].append([[solved[iDeck][(m, a)][coef]
+                                     for a in alpha] for m in mach])
+            iDeck += 1
+        sweeps.append(sweep)
+    return sweeps
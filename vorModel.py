@@ -27,6 +27,11 @@ contains a single AoA and Mach combination by default, suitable for a quick run
 and visualization of the model (see the "VorRun" script). Modify to directly 
 write/run an AoA, AoS, and Mach sweep of interest.
 
+Running the script writes vorlax.in for the inputGeo dictionary below. The
+geometry (deriveGeometry) and deck writing (writeVorlaxInput) are also
+available as functions, so other scripts (e.g. "vorQueue") can import this
+module and generate decks for many cases.
+
 Likewise, customize as needed to reflect the basic configuration/topology of 
 interest. Customization may entail addition/deletion of surfaces, or 
 modification of existing surfaces. The less adventurous may elect to restrict 
@@ -34,8 +39,11 @@ changes to the inputGeo dictionary. In the event the computational bits get
 corrupted, pull a clean copy of the script, and copy/paste the inputGeo 
 dictionary from the corrupted script.
 
-One likely change/addition is a camber line for the edges of panels. This 
-modification would entail changing NAP for the panel to the number of points
+Camber lines for the wing panels are written from the optional airfoilSta*
+entries (NACA 4/5-digit or tabulated sections, see "vorAirfoil"), resampled
+to the chordwise vortex stations; stations without a section are flat.
+For other surfaces, a camber line for the edges of panels entails
+changing NAP for the panel to the number of points
 defining the camber line. The x/c% would follow the panel definition, followed
 by the corresponding y/c% for the inboard y/b and outboard y/b defining the 
 panel. 
@@ -74,7 +82,13 @@ Enjoy!
 Lance Bays
 veranautics@gmail.com
 '''
+import collections
+import hashlib
+import io
+import json
 import math
+
+import vorAirfoil
 # START Changing Inputs Here ***************************
 inputGeo = {'acProject': 'Parametrically Generated Model',
     # WING DEFINITION:
@@ -118,6 +132,10 @@ inputGeo = {'acProject': 'Parametrically Generated Model',
     'zShearInInSta4': 10, # Vertical displacement above dihedral line at station #4
     'zShearInInSta5': 10, # Vertical displacement above dihedral line at station #5
     'zShearInInSta6': 20, # Vertical displacement above dihedral line at station #6
+    # Camber of wing sections at control stations (optional, flat if omitted)
+    # e.g. 'NACA2412', 'NACA23012' or a table, see vorAirfoil
+    # 'airfoilSta1': 'NACA2412', # Section at station #1
+    # 'airfoilSta6': 'NACA2409', # Section at station #6
     # FUSELAGE DEFINITION:
     'lengthFuseInIn': 1497,
     'heightFuseInIn': 148,
@@ -147,656 +165,904 @@ inputGeo = {'acProject': 'Parametrically Generated Model',
     'mrpMacVTailPct': 25,
     # (ADD EXTRA COMPONENTS AS NEEDED)
 }
-# Read path to working directory with exe ...
-fout = open("path.txt", 'r')
-userExePath=fout.readline()
-fout.close()
-
 # STOP Changing Inputs Here ************************
 # Useful degree conversions
 radToDeg = 180 / math.pi
 degToRad = 1 / radToDeg
+# Least height (in) of the lowest panel above the ground plane (HAG runs)
+GROUND_CLEARANCE = 1.
 
-# Determine wing characteristics
-tanDihedralAngle = math.tan(inputGeo['dihedralWingInDeg'] * degToRad)
-tanSweepLeWing = math.tan(inputGeo['sweepLeWingInDeg'] * degToRad)
-sRefInIn2 = 144 * inputGeo['sRefInFt2']
-bInIn = (sRefInIn2 * inputGeo['arWing'])**0.5
-bOver2InIn = bInIn / 2
-halfFuseInIn = inputGeo['bSta1OverHalfSpan'] * bOver2InIn
-cRootInIn = 2 * sRefInIn2 / bInIn / (1 + inputGeo['taperWingInDecimal'])
-cMacInIn = 2 / 3 * cRootInIn * (1 + inputGeo['taperWingInDecimal'] + \
-                                inputGeo['taperWingInDecimal']**2) / \
-                                (1 + inputGeo['taperWingInDecimal']) 
-cTipInIn = cRootInIn * inputGeo['taperWingInDecimal']
-sweepQtrChordWingInDeg = radToDeg * math.atan((bOver2InIn * tanSweepLeWing + \
-                         cTipInIn / 4 - cRootInIn / 4) / bOver2InIn)
-yMacInIn = bInIn / 6 * ((1 + 2 * inputGeo['taperWingInDecimal']) / \
-                        (1 + inputGeo['taperWingInDecimal']))
-zMrpInIn = (yMacInIn - halfFuseInIn) * tanDihedralAngle
-xLeMacInIn = inputGeo['xDistWingApexInIn'] + bOver2InIn * tanSweepLeWing * \
-             1 / 3 * (1 + 2 * inputGeo['taperWingInDecimal']) / \
-             (1 + inputGeo['taperWingInDecimal']) 
-xMrpInIn = xLeMacInIn + cMacInIn * inputGeo['mrpMacPct'] / 100 
-cWingFuseInIn = cRootInIn - \
-                inputGeo['bSta1OverHalfSpan'] * (cRootInIn - cTipInIn) 
-xWingFuseInIn = inputGeo['xDistWingApexInIn'] + halfFuseInIn * tanSweepLeWing 
-xTipInIn = inputGeo['xDistWingApexInIn'] + bOver2InIn * tanSweepLeWing
-zTipInIn = (bOver2InIn - halfFuseInIn) * tanDihedralAngle
-
-# Determine spanwise location of wing control stations 
-ySta1InIn = inputGeo['bSta1OverHalfSpan'] * bInIn / 2
-ySta2InIn = inputGeo['bSta2OverHalfSpan'] * bInIn / 2
-ySta3InIn = inputGeo['bSta3OverHalfSpan'] * bInIn / 2
-ySta4InIn = inputGeo['bSta4OverHalfSpan'] * bInIn / 2
-ySta5InIn = inputGeo['bSta5OverHalfSpan'] * bInIn / 2
-ySta6InIn = bInIn / 2
-
-# Determine chord lengths at wing control stations
-chordSta1InIn = (cRootInIn - inputGeo['bSta1OverHalfSpan'] * \
-                (cRootInIn - cTipInIn)) * inputGeo['ratioCSta1OverCtrap'] 
-chordSta2InIn = (cRootInIn - inputGeo['bSta2OverHalfSpan'] * \
-                (cRootInIn - cTipInIn)) * inputGeo['ratioCSta2OverCtrap'] 
-chordSta3InIn = (cRootInIn - inputGeo['bSta3OverHalfSpan'] * \
-                (cRootInIn - cTipInIn)) * inputGeo['ratioCSta3OverCtrap'] 
-chordSta4InIn = (cRootInIn - inputGeo['bSta4OverHalfSpan'] * \
-                (cRootInIn - cTipInIn)) * inputGeo['ratioCSta4OverCtrap'] 
-chordSta5InIn = (cRootInIn - inputGeo['bSta5OverHalfSpan'] * \
-                (cRootInIn - cTipInIn)) * inputGeo['ratioCSta5OverCtrap'] 
-chordSta6InIn = cTipInIn * inputGeo['ratioCSta6OverCtrap']
-
-# Determine horizontal tail characteristics
-tanHTailDihedralAngle = math.tan(inputGeo['dihedralHTailInDeg'] * degToRad)
-tanHTailIncidence = math.tan(inputGeo['hTailIncidenceInDeg'] * degToRad)
-cosHTailIncidence = math.cos(inputGeo['hTailIncidenceInDeg'] * degToRad)
-tanSweepLeHTail = math.tan(inputGeo['sweepLeHTailInDeg'] * degToRad)
-sRefHTailInIn2 = 144 * inputGeo['sRefHTailInFt2'] 
-bHTailInIn = (sRefHTailInIn2 * inputGeo['arHTail'])**0.5 
-bOver2HTailInIn = bHTailInIn / 2
-cRootHTailInIn = 2 * sRefHTailInIn2 / bHTailInIn / \
-                 (1 + inputGeo['taperHTailInDecimal'])
-cMacHTailInIn = 2 / 3 * cRootHTailInIn * (1 + inputGeo['taperHTailInDecimal'] \
-                + inputGeo['taperHTailInDecimal']**2) / \
-                (1 + inputGeo['taperHTailInDecimal']) 
-cTipHTailInIn = cRootHTailInIn * inputGeo['taperHTailInDecimal'] 
-sweepQtrChordHTailWingInDeg = radToDeg * math.atan((bOver2HTailInIn * \
-   tanSweepLeHTail + cTipHTailInIn / 4 - cRootHTailInIn / 4) / bOver2HTailInIn)
-yMacHTailInIn = bHTailInIn / 6 * ((1 + 2 * inputGeo['taperHTailInDecimal']) / \
-                (1 + inputGeo['taperHTailInDecimal'])) 
-zMrpHTailInIn = (yMacHTailInIn - halfFuseInIn) * tanHTailDihedralAngle
-xLeMacHTailInIn = inputGeo['xDistHTailApexInIn'] + bOver2HTailInIn * \
-        tanSweepLeHTail * 1 / 3 * (1 + 2 * inputGeo['taperHTailInDecimal']) / \
-        (1 + inputGeo['taperHTailInDecimal']) 
-xMrpHTailInIn = xLeMacHTailInIn + \
-                cMacHTailInIn * inputGeo['mrpMacHTailPct'] / 100 
-cFuseHTailInIn = cRootHTailInIn - inputGeo['bSta1OverHalfSpan'] * \
-                bOver2InIn / bOver2HTailInIn * (cRootHTailInIn - cTipHTailInIn) 
-xFuseHTailInIn = inputGeo['xDistHTailApexInIn'] + halfFuseInIn * \
-                 tanSweepLeHTail 
-xTipHTailInIn = inputGeo['xDistHTailApexInIn'] + \
-                bOver2HTailInIn * tanSweepLeHTail 
-zTipHTailInIn = (bOver2HTailInIn - halfFuseInIn) * tanHTailDihedralAngle
-hTailVolCoeff = (xMrpHTailInIn - xMrpInIn) * sRefHTailInIn2 / \
-                (cMacInIn * sRefInIn2)
-
-# Determine vertical tail characteristics 
-tanSweepLeVTail = math.tan(inputGeo['sweepLeVTailInDeg'] * degToRad)
-sRefVTailInIn2 = 144 * inputGeo['sRefVTailInFt2'] 
-bVTailInIn = (sRefVTailInIn2 * inputGeo['arVTail'])**0.5 
-cRootVTailInIn = 2 * sRefVTailInIn2 / bVTailInIn / \
-                 (1 + inputGeo['taperVTailInDecimal']) 
-cMacVTailInIn = 2 / 3 * cRootVTailInIn * \
-                (1 + inputGeo['taperVTailInDecimal'] + \
-                inputGeo['taperVTailInDecimal']**2) / \
-                (1 + inputGeo['taperVTailInDecimal'])
-cTipVTailInIn = cRootVTailInIn * inputGeo['taperVTailInDecimal'] 
-sweepQtrChordVTailWingInDeg = radToDeg * math.atan((bVTailInIn * \
-                        tanSweepLeVTail + \
-                        cTipVTailInIn / 4 - cRootVTailInIn / 4) / bVTailInIn)
-zMacVTailInIn = bVTailInIn / 3 * ((1 + 2 * inputGeo['taperVTailInDecimal']) / \
-                (1 + inputGeo['taperVTailInDecimal'])) 
-xLeMacVTailInIn = inputGeo['xDistVTailBaseInIn'] + bVTailInIn * \
-        tanSweepLeVTail * 1 / 3 * (1 + 2 * inputGeo['taperVTailInDecimal']) / \
-              (1 + inputGeo['taperVTailInDecimal']) 
-xMrpVTailInIn = xLeMacVTailInIn + \
-                cMacVTailInIn * inputGeo['mrpMacVTailPct'] / 100 
-xTipVTailInIn = inputGeo['xDistVTailBaseInIn'] + \
-                bVTailInIn * tanSweepLeVTail 
-yTipVTailInIn = inputGeo['yDispVTailBaseInIn'] + \
-                bVTailInIn * math.tan(inputGeo['tiltVTailInDeg'] * degToRad) 
-vTailVolCoeff = (xMrpVTailInIn - xMrpInIn) * sRefVTailInIn2 / \
-                (bInIn * sRefInIn2) 
-if inputGeo['isVTailOn'] < 0: 
-    zBaseVTailInIn = 0 
-    zTipVTailInIn = -bVTailInIn 
-    zMacVTailInIn = -zMacVTailInIn
-else:
-    zBaseVTailInIn = inputGeo['heightFuseInIn']
-    zTipVTailInIn = zBaseVTailInIn + bVTailInIn 
-    zMacVTailInIn = zBaseVTailInIn + zMacVTailInIn
-    
-iQuantVTail = 1 # Default to single tail
-if inputGeo['tiltVTailInDeg'] != 0 or inputGeo['yDispVTailBaseInIn'] > 0: 
-    iQuantVTail = 2
-    
-# Write VORLAX input file **************
-# Split drive letter from path
-drive, exePath = userExePath.split("\\", 1)
-# Handle case where user doesn't include drive in path... 
-# we will assume it's on the C drive
-if not drive: drive = "C:"
-# Open input file for write
-fin = open(drive + "\\" + exePath + "\\vorlax.in", 'w')
-# Write line 1 inputs
-fin.write('Auto Generated VORLAX Case\n')
-# Echo Parametric Inputs
-fin.write('*\n')
-fin.write('********* Begin Echo Parametric Inputs *********\n')
-fin.write('*** WING ***\n')
-fin.write('* mrpMacPct: ' + "{:10.3f}".format(inputGeo['mrpMacPct']) + '\n')
-fin.write('* sRefInFt2: ' + "{:10.3f}".format(inputGeo['sRefInFt2']) + '\n')
-fin.write('* arWing: ' + "{:13.3f}".format(inputGeo['arWing']) + '\n')
-fin.write('* taperWingInDecimal: ' + \
-          "{:9.3f}".format(inputGeo['taperWingInDecimal']) + '\n')
-fin.write('* sweepLeWingInDeg: ' + \
-          "{:11.3f}".format(inputGeo['sweepLeWingInDeg']) + '\n')
-fin.write('* dihedralWingInDeg: ' + \
-          "{:10.3f}".format(inputGeo['dihedralWingInDeg']) + '\n')
-fin.write('* xDistWingApexInIn: ' + \
-          "{:10.3f}".format(inputGeo['xDistWingApexInIn']) + '\n')
-fin.write('*\n')
-
-fin.write('*Spanwise location of control stations:\n')
-fin.write('* bSta1OverHalfSpan: ' + \
-          "{:10.3f}".format(inputGeo['bSta1OverHalfSpan']) + \
-          ' #Fraction of half span, station 1 (fuse)\n')
-fin.write('* bSta2OverHalfSpan: ' + \
-          "{:10.3f}".format(inputGeo['bSta2OverHalfSpan']) + \
-          ' #Fraction of half span, station 2\n')
-fin.write('* bSta3OverHalfSpan: ' + \
-          "{:10.3f}".format(inputGeo['bSta3OverHalfSpan']) + \
-          ' #Fraction of half span, station 3\n') 
-fin.write('* bSta4OverHalfSpan: ' + \
-          "{:10.3f}".format(inputGeo['bSta4OverHalfSpan']) + \
-          ' #Fraction of half span, station 4\n') 
-fin.write('* bSta5OverHalfSpan: ' + \
-          "{:10.3f}".format(inputGeo['bSta5OverHalfSpan']) + \
-          ' #Fraction of half span, station 5\n') 
-fin.write('*\n')
-
-fin.write('*Variation of chord from trapazoidal wing at control stations:\n')
-fin.write('* ratioCSta1OverCtrap: ' + \
-          "{:10.3f}".format(inputGeo['ratioCSta1OverCtrap']) + \
-          ' #Ratio actual to ref chord, station 1\n')
-fin.write('* ratioCSta2OverCtrap: ' + \
-          "{:10.3f}".format(inputGeo['ratioCSta2OverCtrap']) + \
-          ' #Ratio actual to ref chord, station 2\n') 
-fin.write('* ratioCSta3OverCtrap: ' + \
-          "{:10.3f}".format(inputGeo['ratioCSta3OverCtrap']) + \
-          ' #Ratio actual to ref chord, station 3\n')
-fin.write('* ratioCSta4OverCtrap: ' + \
-          "{:10.3f}".format(inputGeo['ratioCSta4OverCtrap']) + \
-          ' #Ratio actual to ref chord, station 4\n')
-fin.write('* ratioCSta5OverCtrap: ' + \
-          "{:10.3f}".format(inputGeo['ratioCSta5OverCtrap']) + \
-          ' #Ratio actual to ref chord, station 5\n')
-fin.write('* ratioCSta6OverCtrap: ' + \
-          "{:10.3f}".format(inputGeo['ratioCSta6OverCtrap']) + \
-          ' #Ratio actual to ref chord, station 6\n')
-fin.write('*\n')
-
-fin.write('*Variation of sweep from reference value at control stations:\n')
-fin.write('* sweepIncrDegSta1: ' + \
-          "{:10.3f}".format(inputGeo['sweepIncrDegSta1']) + \
-          ' #Increment in sweep, station 1 to 2\n')
-fin.write('* sweepIncrDegSta2: ' + \
-          "{:10.3f}".format(inputGeo['sweepIncrDegSta2']) + \
-          ' #Increment in sweep, station 2 to 3\n')
-fin.write('* sweepIncrDegSta3: ' + \
-          "{:10.3f}".format(inputGeo['sweepIncrDegSta3']) + \
-          ' #Increment in sweep, station 3 to 4\n')
-fin.write('* sweepIncrDegSta4: ' + \
-          "{:10.3f}".format(inputGeo['sweepIncrDegSta4']) + \
-          ' #Increment in sweep, station 4 to 5\n')
-fin.write('* sweepIncrDegSta5: ' + \
-          "{:10.3f}".format(inputGeo['sweepIncrDegSta5']) + \
-          ' #Increment in sweep, station 5 to 6\n')
-fin.write('*\n')
-
-fin.write('*Incidence at control stations - positive = wash-OUT (TE UP):\n')
-fin.write('* incidenceDegSta1: ' + \
-          "{:10.3f}".format(inputGeo['incidenceDegSta1']) + \
-          ' #Incidence at station 1\n')
-fin.write('* incidenceDegSta2: ' + \
-          "{:10.3f}".format(inputGeo['incidenceDegSta2']) + \
-          ' #Incidence at station 2\n') 
-fin.write('* incidenceDegSta3: ' + \
-          "{:10.3f}".format(inputGeo['incidenceDegSta3']) + \
-          ' #Incidence at station 3\n')
-fin.write('* incidenceDegSta4: ' + \
-          "{:10.3f}".format(inputGeo['incidenceDegSta4']) + \
-          ' #Incidence at station 4\n')
-fin.write('* incidenceDegSta5: ' + \
-          "{:10.3f}".format(inputGeo['incidenceDegSta5']) + \
-          ' #Incidence at station 5\n')
-fin.write('* incidenceDegSta6: ' + \
-          "{:10.3f}".format(inputGeo['incidenceDegSta6']) + \
-          ' #Incidence at station 6\n')
-fin.write('*\n')
-
-fin.write('*Vertical shear at stations, positive = UP from dihedral line:\n')
-fin.write('* zShearInInSta1: ' + \
-          "{:10.3f}".format(inputGeo['zShearInInSta1']) + \
-          ' #Vertical displacement at station 1\n')
-fin.write('* zShearInInSta2: ' + \
-          "{:10.3f}".format(inputGeo['zShearInInSta2']) + \
-          ' #Vertical displacement at station 2\n') 
-fin.write('* zShearInInSta3: ' + \
-          "{:10.3f}".format(inputGeo['zShearInInSta3']) + \
-          ' #Vertical displacement at station 3\n')
-fin.write('* zShearInInSta4: ' + \
-          "{:10.3f}".format(inputGeo['zShearInInSta4']) + \
-          ' #Vertical displacement at station 4\n')
-fin.write('* zShearInInSta5: ' + \
-          "{:10.3f}".format(inputGeo['zShearInInSta5']) + \
-          ' #Vertical displacement at station 5\n')
-fin.write('* zShearInInSta6: ' + \
-          "{:10.3f}".format(inputGeo['zShearInInSta6']) + \
-          ' #Vertical displacement at station 6\n')
-fin.write('*\n')
-
-fin.write('*** FUSELAGE ***\n') 
-fin.write('* heightFuseInIn: ' + \
-          "{:10.3f}".format(inputGeo['heightFuseInIn']) + '\n') 
-fin.write('* lengthFuseInIn: ' + \
-          "{:10.3f}".format(inputGeo['lengthFuseInIn']) + '\n') 
-fin.write('* noseTopAngle: ' + \
-          "{:12.3f}".format(inputGeo['noseTopAngle']) + '\n')
-fin.write('* noseSideAngle: ' + \
-          "{:11.3f}".format(inputGeo['noseSideAngle']) + ' \n')
-fin.write('* tailTopAngle: ' + \
-          "{:12.3f}".format(inputGeo['tailTopAngle']) + '\n')
-fin.write('* tailSideAngle: ' + \
-          "{:11.3f}".format(inputGeo['tailSideAngle']) + '\n')
-fin.write('*\n')
-
-fin.write('*** HORIZONTAL TAIL ***\n')
-fin.write('* isHTailOn: ' + \
-          "{:19d}".format(inputGeo['isHTailOn']) + ' # OFF=0; ON=1\n')
-fin.write('* mrpMacHTailPct: ' + \
-          "{:14.3f}".format(inputGeo['mrpMacHTailPct']) + '\n')
-fin.write('* sRefHTailInFt2: ' + \
-          "{:14.3f}".format(inputGeo['sRefHTailInFt2']) + '\n')
-fin.write('* arHTail: ' + \
-          "{:21.3f}".format(inputGeo['arHTail']) + '\n')
-fin.write('* taperHTailInDecimal:' + \
-          "{:10.3f}".format(inputGeo['taperHTailInDecimal']) + '\n')
-fin.write('* sweepLeHTailInDeg: ' + \
-          "{:11.3f}".format(inputGeo['sweepLeHTailInDeg']) + '\n')
-fin.write('* dihedralHTailInDeg: ' + \
-          "{:10.3f}".format(inputGeo['dihedralHTailInDeg']) + '\n')
-fin.write('* xDistHTailApexInIn: ' + \
-          "{:10.3f}".format(inputGeo['xDistHTailApexInIn']) + '\n')
-fin.write('* hTailIncidenceInDeg:' + \
-          "{:10.3f}".format(inputGeo['hTailIncidenceInDeg']) + \
-          ' # Positive = TE down\n')
-fin.write('*\n')
-
-fin.write('*** VERTICAL TAIL ***\n')
-fin.write('* isVTailOn: ' + \
-          "{:19d}".format(inputGeo['isVTailOn']) + \
-          ' # OFF=0; ON,UPPER=1, ON,LOWER=-1\n')
-fin.write('* mrpMacVTailPct: ' + \
-          "{:14.3f}".format(inputGeo['mrpMacVTailPct']) + '\n')
-fin.write('* sRefVTailInFt2: ' + \
-          "{:14.3f}".format(inputGeo['sRefVTailInFt2']) + '\n')
-fin.write('* arVTail: ' + \
-          "{:21.3f}".format(inputGeo['arVTail']) + '\n')
-fin.write('* taperVTailInDecimal:' + \
-          "{:10.3f}".format(inputGeo['taperVTailInDecimal']) + '\n')
-fin.write('* sweepLeVTailInDeg: ' + \
-          "{:11.3f}".format(inputGeo['sweepLeVTailInDeg']) + '\n')
-fin.write('* tiltVTailInDeg: ' + \
-          "{:14.3f}".format(inputGeo['tiltVTailInDeg']) + \
-          ' # Vertical=0, Tilt Out=+, Tilt In=-\n')
-fin.write('* yDispVTailBaseInIn: ' + \
-          "{:10.3f}".format(inputGeo['yDispVTailBaseInIn']) + \
-          ' # Spanwise location base vertical tail\n')
-fin.write('* xDistVTailBaseInIn: ' + \
-          "{:10.3f}".format(inputGeo['xDistVTailBaseInIn']) + '\n')
-fin.write('*\n')
-fin.write('********* End Echo Parametric Inputs *********\n')
-fin.write('\n')
-fin.write('\n')
-fin.write('********* Begin VORLAX Input Deck *********\n')
-'''
-See NASA CR BEFORE CHANGING HARDWIRED INPUTS
 
-'''
-fin.write('*ISOLV       LAX       LAY    REXPAR      ')
-fin.write('HAG    FLOATX    FLOATY    ITRMAX\n')
-fin.write('     0         0         1      0.10')
-fin.write('      0.00      0.00      0.00        99\n')
-
-# MACH AND AoA SWEEP ***************************************
-# Default: run single AoA & Mach in VORLAX
-# Change to other conditions of interest, as needed
-# Mach sweep
-fin.write('*NMACH          MACH\n')
-fin.write('     1           0.2\n')
-# AoA sweep (AoA in degrees)
-fin.write('*NALPHA        ALPHA\n')
-fin.write('     1           0.0\n')
-# **********************************************************
-
-fin.write('*    LATRL       PSI    PITCHQ     ROLLQ      YAWQ      VINF\n')
-fin.write('         0      0.00      0.00      0.00      0.00       1.0\n')
-
-nPan = 7 + inputGeo['isHTailOn'] + abs(inputGeo['isVTailOn'])
-fin.write('*NPAN           SREF      CBAR      XBAR      ZBAR     WSPAN\n')
-fin.write('{:2d}'.format(nPan) +
-          '        ' +
-          "{:10.2f}".format(sRefInIn2) +
-          "{:10.2f}".format(cMacInIn) +
-          "{:10.2f}".format(xMrpInIn) +
-          "{:10.2f}".format(zMrpInIn) +
-          "{:10.2f}".format(bInIn) + '\n')
-fin.write('*\n')
-
-fin.write('*** FUSELAGE PANELS ***\n')
-fin.write('*VORLAX inputs for fuselage:\n')
-
-# Vertical fuselage panel ***
-fin.write('*       X1        Y1        Z1     CORD1')
-fin.write(' COMMENT: VERTICAL FUSELAGE PANEL\n')
-fin.write("{:10.3f}".format(0) +
-          "{:10.3f}".format(0) +
-          "{:10.3f}".format(0) +
-          "{:10.3f}".format(inputGeo['lengthFuseInIn']) + '\n')
-fin.write('*       X2        Y2        Z2     CORD2\n')
-xFuseTopEdgeInIn = inputGeo['heightFuseInIn'] * \
-                   math.tan((inputGeo['noseTopAngle']) * degToRad)
-chordFuseTopEdgeInIn = inputGeo['lengthFuseInIn'] - xFuseTopEdgeInIn - \
-                       inputGeo['heightFuseInIn'] * \
-                       math.tan((inputGeo['tailTopAngle']) * degToRad)
-fin.write("{:10.3f}".format(xFuseTopEdgeInIn) +
-          "{:10.3f}".format(0) +
-          "{:10.3f}".format(inputGeo['heightFuseInIn']) +
-          "{:10.3f}".format(chordFuseTopEdgeInIn) + '\n')
-fin.write('*     NVOR      RNCV       SPC       PDL\n')
-fin.write('        10     15.00      1.00      0.00\n')
-fin.write('*    AINC1     AINC2       ITS       NAP    ')
-fin.write('IQUANT     ISYNT       NPP\n')
-fin.write("{:10.5f}".format(0) +
-          "{:10.5f}".format(0) +
-          '         0         0         1         0         0\n')
-fin.write('*\n')
-
-# Horizontal fuselage panel ***
-fin.write('*       X1        Y1        Z1     CORD1')
-fin.write(' COMMENT: HORIZONTAL FUSELAGE PANEL\n') 
-fin.write("{:10.3f}".format(0) +
-          "{:10.3f}".format(0) +
-          "{:10.3f}".format(0) +
-          "{:10.3f}".format(inputGeo['lengthFuseInIn']) + '\n')
-fin.write('*       X2        Y2        Z2     CORD2\n')
-xFuseSideEdgeInIn = ySta1InIn * math.tan((inputGeo['noseSideAngle'])*degToRad)
-chordFuseSideEdgeInIn = inputGeo['lengthFuseInIn'] - xFuseSideEdgeInIn - \
-                   ySta1InIn * math.tan((inputGeo['tailSideAngle']) * degToRad)
-fin.write("{:10.3f}".format(xFuseSideEdgeInIn) +
-          "{:10.3f}".format(ySta1InIn) +
-          "{:10.3f}".format(0) +
-          "{:10.3f}".format(chordFuseSideEdgeInIn) + '\n')
-fin.write('*     NVOR      RNCV       SPC       PDL\n')
-fin.write('        10     15.00      1.00      0.00\n')
-fin.write('*    AINC1     AINC2       ITS       NAP    ')
-fin.write('IQUANT     ISYNT       NPP\n')
-fin.write("{:10.5f}".format(0) +
-          "{:10.5f}".format(0) +
-          '         0         0         2         0         0\n')
-fin.write('*\n')
-
-# Wing panels
-fin.write('*** WING PANELS ***\n')
-fin.write('*Derived Geometric Data for Reference Wing:\n') 
-fin.write('* Wing Span (in):' +
-          "{:10.3f}".format(bInIn) + '\n') 
-fin.write('* Root Chord (in):' +
-          "{:9.3f}".format(cRootInIn) + '\n') 
-fin.write('* Tip Chord (in):' +
-          "{:10.3f}".format(cTipInIn) + '\n') 
-fin.write('* MAC Chord (in):' +
-          "{:10.3f}".format(cMacInIn) + '\n') 
-fin.write('* x MRP (in):' +
-          "{:14.3f}".format(xMrpInIn) + '\n') 
-fin.write('* z MRP (in):' +
-          "{:14.3f}".format(zMrpInIn) + '\n') 
-fin.write('* y (in):' +
-          "{:18.3f}".format(yMacInIn) + '\n') 
-fin.write('* Sweep 1/4C (deg):' +
-          "{:8.3f}".format(sweepQtrChordWingInDeg) + '\n')
-fin.write('*\n')
-fin.write('*VORLAX inputs for Wing:\n')
-
-# Inboard-most wing panel ***
-fin.write('*       X1        Y1        Z1     CORD1')
-fin.write(' COMMENT: INBOARD-MOST WING PANEL\n')
-fin.write("{:10.3f}".format(xWingFuseInIn) +
-          "{:10.3f}".format(ySta1InIn) +
-          "{:10.3f}".format(tanDihedralAngle * (ySta1InIn - halfFuseInIn) +
-          inputGeo['zShearInInSta1']) +
-          "{:10.3f}".format(chordSta1InIn) + '\n')
-fin.write('*       X2        Y2        Z2     CORD2\n')
-xSta2InIn = xWingFuseInIn + (ySta2InIn - ySta1InIn) * \
-            math.tan((inputGeo['sweepLeWingInDeg'] + \
-            inputGeo['sweepIncrDegSta1']) * degToRad)
-fin.write("{:10.3f}".format(xSta2InIn) +
-          "{:10.3f}".format(ySta2InIn) +
-          "{:10.3f}".format(tanDihedralAngle * (ySta2InIn - halfFuseInIn) +
-          inputGeo['zShearInInSta2']) +
-          "{:10.3f}".format(chordSta2InIn) + '\n')
-fin.write('*     NVOR      RNCV       SPC       PDL\n')
-fin.write('        10     15.00      1.00      0.00\n')
-fin.write('*    AINC1     AINC2       ITS       NAP    ')
-fin.write('IQUANT     ISYNT       NPP\n')
-fin.write("{:10.5f}".format(math.tan(inputGeo['incidenceDegSta1'] * degToRad))+ 
-         "{:10.5f}".format(math.tan(inputGeo['incidenceDegSta2'] * degToRad)) + 
-         '         0        0          2         0         0\n')
-fin.write('*\n')
-
-# Second-most inboard wing panel ***
-fin.write('*       X1        Y1        Z1     CORD1')
-fin.write(' COMMENT: SECOND INBOARD WING PANEL\n') 
-fin.write("{:10.3f}".format(xSta2InIn) +
-          "{:10.3f}".format(ySta2InIn) +
-          "{:10.3f}".format(tanDihedralAngle * (ySta2InIn - halfFuseInIn) +
-          inputGeo['zShearInInSta2']) +
-          "{:10.3f}".format(chordSta2InIn) + '\n') 
-fin.write('*       X2        Y2        Z2     CORD2\n')
-xSta3InIn = xSta2InIn + (ySta3InIn - ySta2InIn) * \
-            math.tan((inputGeo['sweepLeWingInDeg'] + \
-            inputGeo['sweepIncrDegSta2']) * degToRad)
-fin.write("{:10.3f}".format(xSta3InIn) + \
-          "{:10.3f}".format(ySta3InIn) +
-          "{:10.3f}".format(tanDihedralAngle * (ySta3InIn - halfFuseInIn) +
-          inputGeo['zShearInInSta3']) +
-          "{:10.3f}".format(chordSta3InIn) + '\n')
-fin.write('*     NVOR      RNCV       SPC       PDL\n')
-fin.write('        10     15.00      1.00      0.00\n')
-fin.write('*    AINC1     AINC2       ITS       NAP    ')
-fin.write('IQUANT     ISYNT       NPP\n')
-fin.write("{:10.5f}".format(math.tan(inputGeo['incidenceDegSta2'] * degToRad))+ 
-         "{:10.5f}".format(math.tan(inputGeo['incidenceDegSta3'] * degToRad)) + 
-         '         0        0          2         0         0\n')
-fin.write('*\n')
-
-# Middle wing panel ***
-fin.write('*       X1        Y1        Z1     CORD1')
-fin.write(' COMMENT: MIDDLE WING PANEL\n') 
-fin.write("{:10.3f}".format(xSta3InIn) +
-          "{:10.3f}".format(ySta3InIn) +
-          "{:10.3f}".format(tanDihedralAngle * (ySta3InIn - halfFuseInIn) +
-          inputGeo['zShearInInSta3']) +
-          "{:10.3f}".format(chordSta3InIn) + '\n')
-fin.write('*       X2        Y2        Z2     CORD2\n')
-xSta4InIn = xSta3InIn + (ySta4InIn - ySta3InIn) * \
-            math.tan((inputGeo['sweepLeWingInDeg'] + \
-            inputGeo['sweepIncrDegSta3']) * degToRad)
-fin.write("{:10.3f}".format(xSta4InIn) +
-          "{:10.3f}".format(ySta4InIn) +
-          "{:10.3f}".format(tanDihedralAngle * (ySta4InIn - halfFuseInIn) +
-          inputGeo['zShearInInSta4']) +
-          "{:10.3f}".format(chordSta4InIn) + '\n') 
-fin.write('*     NVOR      RNCV       SPC       PDL\n')
-fin.write('        10     15.00      1.00      0.00\n')
-fin.write('*    AINC1     AINC2       ITS       NAP    ')
-fin.write('IQUANT     ISYNT       NPP\n')
-fin.write("{:10.5f}".format(math.tan(inputGeo['incidenceDegSta3'] * degToRad))+ 
-         "{:10.5f}".format(math.tan(inputGeo['incidenceDegSta4'] * degToRad)) + 
-         '         0        0          2         0         0\n')
-fin.write('*\n')
-
-# Second-most outboard wing panel ***
-fin.write('*       X1        Y1        Z1     CORD1')
-fin.write(' COMMENT: SECOND-MOST OUTBOARD WING PANEL\n') 
-fin.write("{:10.3f}".format(xSta4InIn) +
-          "{:10.3f}".format(ySta4InIn) +
-          "{:10.3f}".format(tanDihedralAngle * (ySta4InIn - halfFuseInIn) +
-          inputGeo['zShearInInSta4']) +
-          "{:10.3f}".format(chordSta4InIn) + '\n') 
-fin.write('*       X2        Y2        Z2     CORD2\n')
-xSta5InIn = xSta4InIn + (ySta5InIn-ySta4InIn) * \
-math.tan((inputGeo['sweepLeWingInDeg'] + \
-          inputGeo['sweepIncrDegSta4']) * degToRad) 
-fin.write("{:10.3f}".format(xSta5InIn) +
-          "{:10.3f}".format(ySta5InIn) +
-          "{:10.3f}".format(tanDihedralAngle * (ySta5InIn - halfFuseInIn) +
-          inputGeo['zShearInInSta5']) +
-          "{:10.3f}".format(chordSta5InIn) + '\n')
-fin.write('*     NVOR      RNCV       SPC       PDL\n')
-fin.write('        10     15.00      1.00      0.00\n')
-fin.write('*    AINC1     AINC2       ITS       NAP    ')
-fin.write('IQUANT     ISYNT       NPP\n')
-fin.write("{:10.5f}".format(math.tan(inputGeo['incidenceDegSta4'] * degToRad))+ 
-         "{:10.5f}".format(math.tan(inputGeo['incidenceDegSta5'] * degToRad)) + 
-         '         0        0          2         0         0\n')
-fin.write('*\n')
-
-# Outboard-most wing panel ***
-fin.write('*       X1        Y1        Z1     CORD1')
-fin.write(' COMMENT: MOST OUTBOARD WING PANEL\n') 
-fin.write("{:10.3f}".format(xSta5InIn) +
-          "{:10.3f}".format(ySta5InIn) +
-          "{:10.3f}".format(tanDihedralAngle * (ySta5InIn - halfFuseInIn) +
-          inputGeo['zShearInInSta5']) +
-          "{:10.3f}".format(chordSta5InIn) + '\n')
-fin.write('*       X2        Y2        Z2     CORD2\n')
-xSta6InIn = xSta5InIn + (ySta6InIn-ySta5InIn) * \
-            math.tan((inputGeo['sweepLeWingInDeg'] + \
-            inputGeo['sweepIncrDegSta5']) * degToRad) 
-fin.write("{:10.3f}".format(xSta6InIn) +
-          "{:10.3f}".format(ySta6InIn) +
-          "{:10.3f}".format(tanDihedralAngle * (ySta6InIn - halfFuseInIn) +
-          inputGeo['zShearInInSta6']) +
-          "{:10.3f}".format(chordSta6InIn) + '\n')
-fin.write('*     NVOR      RNCV       SPC       PDL\n')
-fin.write('        10     15.00      1.00      0.00\n')
-fin.write('*    AINC1     AINC2       ITS       NAP    ')
-fin.write('IQUANT     ISYNT       NPP\n')
-fin.write("{:10.5f}".format(math.tan(inputGeo['incidenceDegSta5'] * degToRad))+ 
-         "{:10.5f}".format(math.tan(inputGeo['incidenceDegSta6'] * degToRad)) + 
-         '         0        0          2         0         0\n')
-fin.write('*\n')
-
-# Horizontal tail panel ***
-if inputGeo['isHTailOn'] != 0:
-    fin.write('*** HORIZONTAL TAIL PANEL ***\n')
-    fin.write('*Derived Geometric Data for Horizontal Tail:\n') 
-    fin.write('* Span (in):' +
-              "{:15.3f}".format(bHTailInIn) + '\n')
-    fin.write('* Root Chord (in):' +
-              "{:9.3f}".format(cRootHTailInIn) + '\n')
-    fin.write('* Tip Chord (in):' +
-              "{:10.3f}".format(cTipHTailInIn) + '\n')
-    fin.write('* MAC Chord (in):' +
-              "{:10.3f}".format(cMacHTailInIn) + '\n')
-    fin.write('* x MRP (in):' +
-              "{:14.3f}".format(xMrpHTailInIn) + '\n')
-    fin.write('* y MAC (in):' +
-              "{:14.3f}".format(yMacHTailInIn) + '\n')
-    fin.write('* Sweep 1/4C (deg):' +
-              "{:8.3f}".format(sweepQtrChordHTailWingInDeg) + '\n') 
-    fin.write('* Tail Volume Coefficient:' +
-              "{:12.5f}".format(hTailVolCoeff) + '\n')
+def vorlaxInputPath(pathFile="path.txt"):
+    """Return the full path of vorlax.in in the Vorlax exe directory.
+
+    Reads the exe directory from the first line of pathFile; assumes the
+    C-drive if the path begins with "\\".
+    """
+    # Read path to working directory with exe ...
+    fout = open(pathFile, 'r')
+    userExePath = fout.readline()
+    fout.close()
+    # Split drive letter from path
+    drive, exePath = userExePath.split("\\", 1)
+    # Handle case where user doesn't include drive in path... 
+    # we will assume it's on the C drive
+    if not drive: drive = "C:"
+    return drive + "\\" + exePath + "\\vorlax.in"
+
+
+def caseHash(case):
+    """Return a stable hex digest identifying a case (e.g. an inputGeo
+    dict, or a dict holding inputGeo plus run conditions)."""
+    text = json.dumps(case, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def deriveGeometry(inputGeo):
+    """Return a dict of derived geometry (chords, MRP, tail volume
+    coefficients, control station coordinates, etc.) for inputGeo."""
+    # Determine wing characteristics
+    tanDihedralAngle = math.tan(inputGeo['dihedralWingInDeg'] * degToRad)
+    tanSweepLeWing = math.tan(inputGeo['sweepLeWingInDeg'] * degToRad)
+    sRefInIn2 = 144 * inputGeo['sRefInFt2']
+    bInIn = (sRefInIn2 * inputGeo['arWing'])**0.5
+    bOver2InIn = bInIn / 2
+    halfFuseInIn = inputGeo['bSta1OverHalfSpan'] * bOver2InIn
+    cRootInIn = 2 * sRefInIn2 / bInIn / (1 + inputGeo['taperWingInDecimal'])
+    cMacInIn = 2 / 3 * cRootInIn * (1 + inputGeo['taperWingInDecimal'] + \
+                                    inputGeo['taperWingInDecimal']**2) / \
+                                    (1 + inputGeo['taperWingInDecimal'])
+    cTipInIn = cRootInIn * inputGeo['taperWingInDecimal']
+    sweepQtrChordWingInDeg = radToDeg * math.atan((bOver2InIn * tanSweepLeWing + \
+                             cTipInIn / 4 - cRootInIn / 4) / bOver2InIn)
+    yMacInIn = bInIn / 6 * ((1 + 2 * inputGeo['taperWingInDecimal']) / \
+                            (1 + inputGeo['taperWingInDecimal']))
+    zMrpInIn = (yMacInIn - halfFuseInIn) * tanDihedralAngle
+    xLeMacInIn = inputGeo['xDistWingApexInIn'] + bOver2InIn * tanSweepLeWing * \
+                 1 / 3 * (1 + 2 * inputGeo['taperWingInDecimal']) / \
+                 (1 + inputGeo['taperWingInDecimal'])
+    xMrpInIn = xLeMacInIn + cMacInIn * inputGeo['mrpMacPct'] / 100
+    cWingFuseInIn = cRootInIn - \
+                    inputGeo['bSta1OverHalfSpan'] * (cRootInIn - cTipInIn)
+    xWingFuseInIn = inputGeo['xDistWingApexInIn'] + halfFuseInIn * tanSweepLeWing
+    xTipInIn = inputGeo['xDistWingApexInIn'] + bOver2InIn * tanSweepLeWing
+    zTipInIn = (bOver2InIn - halfFuseInIn) * tanDihedralAngle
+
+    # Determine spanwise location of wing control stations
+    ySta1InIn = inputGeo['bSta1OverHalfSpan'] * bInIn / 2
+    ySta2InIn = inputGeo['bSta2OverHalfSpan'] * bInIn / 2
+    ySta3InIn = inputGeo['bSta3OverHalfSpan'] * bInIn / 2
+    ySta4InIn = inputGeo['bSta4OverHalfSpan'] * bInIn / 2
+    ySta5InIn = inputGeo['bSta5OverHalfSpan'] * bInIn / 2
+    ySta6InIn = bInIn / 2
+
+    # Determine chord lengths at wing control stations
+    chordSta1InIn = (cRootInIn - inputGeo['bSta1OverHalfSpan'] * \
+                    (cRootInIn - cTipInIn)) * inputGeo['ratioCSta1OverCtrap']
+    chordSta2InIn = (cRootInIn - inputGeo['bSta2OverHalfSpan'] * \
+                    (cRootInIn - cTipInIn)) * inputGeo['ratioCSta2OverCtrap']
+    chordSta3InIn = (cRootInIn - inputGeo['bSta3OverHalfSpan'] * \
+                    (cRootInIn - cTipInIn)) * inputGeo['ratioCSta3OverCtrap']
+    chordSta4InIn = (cRootInIn - inputGeo['bSta4OverHalfSpan'] * \
+                    (cRootInIn - cTipInIn)) * inputGeo['ratioCSta4OverCtrap']
+    chordSta5InIn = (cRootInIn - inputGeo['bSta5OverHalfSpan'] * \
+                    (cRootInIn - cTipInIn)) * inputGeo['ratioCSta5OverCtrap']
+    chordSta6InIn = cTipInIn * inputGeo['ratioCSta6OverCtrap']
+
+    # Determine horizontal tail characteristics
+    tanHTailDihedralAngle = math.tan(inputGeo['dihedralHTailInDeg'] * degToRad)
+    tanHTailIncidence = math.tan(inputGeo['hTailIncidenceInDeg'] * degToRad)
+    cosHTailIncidence = math.cos(inputGeo['hTailIncidenceInDeg'] * degToRad)
+    tanSweepLeHTail = math.tan(inputGeo['sweepLeHTailInDeg'] * degToRad)
+    sRefHTailInIn2 = 144 * inputGeo['sRefHTailInFt2']
+    bHTailInIn = (sRefHTailInIn2 * inputGeo['arHTail'])**0.5
+    bOver2HTailInIn = bHTailInIn / 2
+    cRootHTailInIn = 2 * sRefHTailInIn2 / bHTailInIn / \
+                     (1 + inputGeo['taperHTailInDecimal'])
+    cMacHTailInIn = 2 / 3 * cRootHTailInIn * (1 + inputGeo['taperHTailInDecimal'] \
+                    + inputGeo['taperHTailInDecimal']**2) / \
+                    (1 + inputGeo['taperHTailInDecimal'])
+    cTipHTailInIn = cRootHTailInIn * inputGeo['taperHTailInDecimal']
+    sweepQtrChordHTailWingInDeg = radToDeg * math.atan((bOver2HTailInIn * \
+       tanSweepLeHTail + cTipHTailInIn / 4 - cRootHTailInIn / 4) / bOver2HTailInIn)
+    yMacHTailInIn = bHTailInIn / 6 * ((1 + 2 * inputGeo['taperHTailInDecimal']) / \
+                    (1 + inputGeo['taperHTailInDecimal']))
+    zMrpHTailInIn = (yMacHTailInIn - halfFuseInIn) * tanHTailDihedralAngle
+    xLeMacHTailInIn = inputGeo['xDistHTailApexInIn'] + bOver2HTailInIn * \
+            tanSweepLeHTail * 1 / 3 * (1 + 2 * inputGeo['taperHTailInDecimal']) / \
+            (1 + inputGeo['taperHTailInDecimal'])
+    xMrpHTailInIn = xLeMacHTailInIn + \
+                    cMacHTailInIn * inputGeo['mrpMacHTailPct'] / 100
+    cFuseHTailInIn = cRootHTailInIn - inputGeo['bSta1OverHalfSpan'] * \
+                    bOver2InIn / bOver2HTailInIn * (cRootHTailInIn - cTipHTailInIn)
+    xFuseHTailInIn = inputGeo['xDistHTailApexInIn'] + halfFuseInIn * \
+                     tanSweepLeHTail
+    xTipHTailInIn = inputGeo['xDistHTailApexInIn'] + \
+                    bOver2HTailInIn * tanSweepLeHTail
+    zTipHTailInIn = (bOver2HTailInIn - halfFuseInIn) * tanHTailDihedralAngle
+    hTailVolCoeff = (xMrpHTailInIn - xMrpInIn) * sRefHTailInIn2 / \
+                    (cMacInIn * sRefInIn2)
+
+    # Determine vertical tail characteristics
+    tanSweepLeVTail = math.tan(inputGeo['sweepLeVTailInDeg'] * degToRad)
+    sRefVTailInIn2 = 144 * inputGeo['sRefVTailInFt2']
+    bVTailInIn = (sRefVTailInIn2 * inputGeo['arVTail'])**0.5
+    cRootVTailInIn = 2 * sRefVTailInIn2 / bVTailInIn / \
+                     (1 + inputGeo['taperVTailInDecimal'])
+    cMacVTailInIn = 2 / 3 * cRootVTailInIn * \
+                    (1 + inputGeo['taperVTailInDecimal'] + \
+                    inputGeo['taperVTailInDecimal']**2) / \
+                    (1 + inputGeo['taperVTailInDecimal'])
+    cTipVTailInIn = cRootVTailInIn * inputGeo['taperVTailInDecimal']
+    sweepQtrChordVTailWingInDeg = radToDeg * math.atan((bVTailInIn * \
+                            tanSweepLeVTail + \
+                            cTipVTailInIn / 4 - cRootVTailInIn / 4) / bVTailInIn)
+    zMacVTailInIn = bVTailInIn / 3 * ((1 + 2 * inputGeo['taperVTailInDecimal']) / \
+                    (1 + inputGeo['taperVTailInDecimal']))
+    xLeMacVTailInIn = inputGeo['xDistVTailBaseInIn'] + bVTailInIn * \
+            tanSweepLeVTail * 1 / 3 * (1 + 2 * inputGeo['taperVTailInDecimal']) / \
+                  (1 + inputGeo['taperVTailInDecimal'])
+    xMrpVTailInIn = xLeMacVTailInIn + \
+                    cMacVTailInIn * inputGeo['mrpMacVTailPct'] / 100
+    xTipVTailInIn = inputGeo['xDistVTailBaseInIn'] + \
+                    bVTailInIn * tanSweepLeVTail
+    yTipVTailInIn = inputGeo['yDispVTailBaseInIn'] + \
+                    bVTailInIn * math.tan(inputGeo['tiltVTailInDeg'] * degToRad)
+    vTailVolCoeff = (xMrpVTailInIn - xMrpInIn) * sRefVTailInIn2 / \
+                    (bInIn * sRefInIn2)
+    if inputGeo['isVTailOn'] < 0:
+        zBaseVTailInIn = 0
+        zTipVTailInIn = -bVTailInIn
+        zMacVTailInIn = -zMacVTailInIn
+    else:
+        zBaseVTailInIn = inputGeo['heightFuseInIn']
+        zTipVTailInIn = zBaseVTailInIn + bVTailInIn
+        zMacVTailInIn = zBaseVTailInIn + zMacVTailInIn
+
+    iQuantVTail = 1 # Default to single tail
+    if inputGeo['tiltVTailInDeg'] != 0 or inputGeo['yDispVTailBaseInIn'] > 0:
+        iQuantVTail = 2
+
+    # Determine leading edge of fuselage panel edges
+    xFuseTopEdgeInIn = inputGeo['heightFuseInIn'] * \
+                       math.tan((inputGeo['noseTopAngle']) * degToRad)
+    chordFuseTopEdgeInIn = inputGeo['lengthFuseInIn'] - xFuseTopEdgeInIn - \
+                           inputGeo['heightFuseInIn'] * \
+                           math.tan((inputGeo['tailTopAngle']) * degToRad)
+    xFuseSideEdgeInIn = ySta1InIn * math.tan((inputGeo['noseSideAngle'])*degToRad)
+    chordFuseSideEdgeInIn = inputGeo['lengthFuseInIn'] - xFuseSideEdgeInIn - \
+                       ySta1InIn * math.tan((inputGeo['tailSideAngle']) * degToRad)
+
+    # Determine z of wing control stations (dihedral line plus shear)
+    zSta1InIn = tanDihedralAngle * (ySta1InIn - halfFuseInIn) + \
+                inputGeo['zShearInInSta1']
+    zSta2InIn = tanDihedralAngle * (ySta2InIn - halfFuseInIn) + \
+                inputGeo['zShearInInSta2']
+    zSta3InIn = tanDihedralAngle * (ySta3InIn - halfFuseInIn) + \
+                inputGeo['zShearInInSta3']
+    zSta4InIn = tanDihedralAngle * (ySta4InIn - halfFuseInIn) + \
+                inputGeo['zShearInInSta4']
+    zSta5InIn = tanDihedralAngle * (ySta5InIn - halfFuseInIn) + \
+                inputGeo['zShearInInSta5']
+    zSta6InIn = tanDihedralAngle * (ySta6InIn - halfFuseInIn) + \
+                inputGeo['zShearInInSta6']
+
+    # Determine leading edge x of wing control stations
+    xSta2InIn = xWingFuseInIn + (ySta2InIn - ySta1InIn) * \
+                math.tan((inputGeo['sweepLeWingInDeg'] + \
+                inputGeo['sweepIncrDegSta1']) * degToRad)
+    xSta3InIn = xSta2InIn + (ySta3InIn - ySta2InIn) * \
+                math.tan((inputGeo['sweepLeWingInDeg'] + \
+                inputGeo['sweepIncrDegSta2']) * degToRad)
+    xSta4InIn = xSta3InIn + (ySta4InIn - ySta3InIn) * \
+                math.tan((inputGeo['sweepLeWingInDeg'] + \
+                inputGeo['sweepIncrDegSta3']) * degToRad)
+    xSta5InIn = xSta4InIn + (ySta5InIn-ySta4InIn) * \
+                math.tan((inputGeo['sweepLeWingInDeg'] + \
+                inputGeo['sweepIncrDegSta4']) * degToRad)
+    xSta6InIn = xSta5InIn + (ySta6InIn-ySta5InIn) * \
+                math.tan((inputGeo['sweepLeWingInDeg'] + \
+                inputGeo['sweepIncrDegSta5']) * degToRad)
+
+    return {
+        'tanDihedralAngle': tanDihedralAngle,
+        'tanSweepLeWing': tanSweepLeWing,
+        'sRefInIn2': sRefInIn2,
+        'bInIn': bInIn,
+        'bOver2InIn': bOver2InIn,
+        'halfFuseInIn': halfFuseInIn,
+        'cRootInIn': cRootInIn,
+        'cMacInIn': cMacInIn,
+        'cTipInIn': cTipInIn,
+        'sweepQtrChordWingInDeg': sweepQtrChordWingInDeg,
+        'yMacInIn': yMacInIn,
+        'zMrpInIn': zMrpInIn,
+        'xLeMacInIn': xLeMacInIn,
+        'xMrpInIn': xMrpInIn,
+        'cWingFuseInIn': cWingFuseInIn,
+        'xWingFuseInIn': xWingFuseInIn,
+        'xTipInIn': xTipInIn,
+        'zTipInIn': zTipInIn,
+        'ySta1InIn': ySta1InIn,
+        'ySta2InIn': ySta2InIn,
+        'ySta3InIn': ySta3InIn,
+        'ySta4InIn': ySta4InIn,
+        'ySta5InIn': ySta5InIn,
+        'ySta6InIn': ySta6InIn,
+        'chordSta1InIn': chordSta1InIn,
+        'chordSta2InIn': chordSta2InIn,
+        'chordSta3InIn': chordSta3InIn,
+        'chordSta4InIn': chordSta4InIn,
+        'chordSta5InIn': chordSta5InIn,
+        'chordSta6InIn': chordSta6InIn,
+        'tanHTailDihedralAngle': tanHTailDihedralAngle,
+        'tanHTailIncidence': tanHTailIncidence,
+        'cosHTailIncidence': cosHTailIncidence,
+        'tanSweepLeHTail': tanSweepLeHTail,
+        'sRefHTailInIn2': sRefHTailInIn2,
+        'bHTailInIn': bHTailInIn,
+        'bOver2HTailInIn': bOver2HTailInIn,
+        'cRootHTailInIn': cRootHTailInIn,
+        'cMacHTailInIn': cMacHTailInIn,
+        'cTipHTailInIn': cTipHTailInIn,
+        'sweepQtrChordHTailWingInDeg': sweepQtrChordHTailWingInDeg,
+        'yMacHTailInIn': yMacHTailInIn,
+        'zMrpHTailInIn': zMrpHTailInIn,
+        'xLeMacHTailInIn': xLeMacHTailInIn,
+        'xMrpHTailInIn': xMrpHTailInIn,
+        'cFuseHTailInIn': cFuseHTailInIn,
+        'xFuseHTailInIn': xFuseHTailInIn,
+        'xTipHTailInIn': xTipHTailInIn,
+        'zTipHTailInIn': zTipHTailInIn,
+        'hTailVolCoeff': hTailVolCoeff,
+        'tanSweepLeVTail': tanSweepLeVTail,
+        'sRefVTailInIn2': sRefVTailInIn2,
+        'bVTailInIn': bVTailInIn,
+        'cRootVTailInIn': cRootVTailInIn,
+        'cMacVTailInIn': cMacVTailInIn,
+        'cTipVTailInIn': cTipVTailInIn,
+        'sweepQtrChordVTailWingInDeg': sweepQtrChordVTailWingInDeg,
+        'zMacVTailInIn': zMacVTailInIn,
+        'xLeMacVTailInIn': xLeMacVTailInIn,
+        'xMrpVTailInIn': xMrpVTailInIn,
+        'xTipVTailInIn': xTipVTailInIn,
+        'yTipVTailInIn': yTipVTailInIn,
+        'vTailVolCoeff': vTailVolCoeff,
+        'zBaseVTailInIn': zBaseVTailInIn,
+        'zTipVTailInIn': zTipVTailInIn,
+        'iQuantVTail': iQuantVTail,
+        'xFuseTopEdgeInIn': xFuseTopEdgeInIn,
+        'chordFuseTopEdgeInIn': chordFuseTopEdgeInIn,
+        'xFuseSideEdgeInIn': xFuseSideEdgeInIn,
+        'chordFuseSideEdgeInIn': chordFuseSideEdgeInIn,
+        'xSta2InIn': xSta2InIn,
+        'xSta3InIn': xSta3InIn,
+        'xSta4InIn': xSta4InIn,
+        'xSta5InIn': xSta5InIn,
+        'xSta6InIn': xSta6InIn,
+        'zSta1InIn': zSta1InIn,
+        'zSta2InIn': zSta2InIn,
+        'zSta3InIn': zSta3InIn,
+        'zSta4InIn': zSta4InIn,
+        'zSta5InIn': zSta5InIn,
+        'zSta6InIn': zSta6InIn,
+    }
+
+
+def minGroundHeight(inputGeo, geo=None):
+    """Return the smallest HAG (in) that keeps every panel above the
+    ground plane: zMrp minus the lowest z of the geometry (the fuselage
+    keel at z = 0, wing stations, tail tips)."""
+    if geo is None:
+        geo = deriveGeometry(inputGeo)
+    zs = [0] + [geo['zSta' + str(iSta) + 'InIn'] for iSta in range(1, 7)]
+    if inputGeo['isHTailOn'] != 0:
+        zs.append(geo['zTipHTailInIn'])
+    if inputGeo['isVTailOn'] != 0:
+        zs += [geo['zBaseVTailInIn'], geo['zTipVTailInIn']]
+    return geo['zMrpInIn'] - min(zs)
+
+
+def checkGroundHeights(inputGeo, heights, geo=None):
+    """Raise ValueError unless every HAG in heights (in) is 0 (free air)
+    or keeps the lowest panel GROUND_CLEARANCE above the ground."""
+    hLowest = minGroundHeight(inputGeo, geo) + GROUND_CLEARANCE
+    for h in heights:
+        if h < 0 or 0 < h < hLowest:
+            raise ValueError('HAG ' + str(h) + ' in puts the geometry ' +
+                             'below the ground, use 0 (free air) or at ' +
+                             'least ' + "{:.2f}".format(hLowest) + ' in')
+
+
+def _conditionCards(values):
+    # Count, then up to seven F10 values per card (continuation cards are
+    # indented past the count field)
+    text = "{:6d}".format(len(values)) + '    '
+    for i, value in enumerate(values):
+        if i and i % 7 == 0:
+            text += '\n' + ' ' * 10
+        text += "{:>10}".format(repr(round(float(value), 4)))
+    return text + '\n'
+
+
+def _writeEchoInputs(fin, inputGeo):
+    # Title card and echo of the parametric inputs as comments
+    # Write line 1 inputs
+    fin.write('Auto Generated VORLAX Case\n')
+    # Echo Parametric Inputs
+    fin.write('*\n')
+    fin.write('********* Begin Echo Parametric Inputs *********\n')
+    fin.write('*** WING ***\n')
+    fin.write('* mrpMacPct: ' + "{:10.3f}".format(inputGeo['mrpMacPct']) + '\n')
+    fin.write('* sRefInFt2: ' + "{:10.3f}".format(inputGeo['sRefInFt2']) + '\n')
+    fin.write('* arWing: ' + "{:13.3f}".format(inputGeo['arWing']) + '\n')
+    fin.write('* taperWingInDecimal: ' + \
+              "{:9.3f}".format(inputGeo['taperWingInDecimal']) + '\n')
+    fin.write('* sweepLeWingInDeg: ' + \
+              "{:11.3f}".format(inputGeo['sweepLeWingInDeg']) + '\n')
+    fin.write('* dihedralWingInDeg: ' + \
+              "{:10.3f}".format(inputGeo['dihedralWingInDeg']) + '\n')
+    fin.write('* xDistWingApexInIn: ' + \
+              "{:10.3f}".format(inputGeo['xDistWingApexInIn']) + '\n')
+    fin.write('*\n')
+
+    fin.write('*Spanwise location of control stations:\n')
+    fin.write('* bSta1OverHalfSpan: ' + \
+              "{:10.3f}".format(inputGeo['bSta1OverHalfSpan']) + \
+              ' #Fraction of half span, station 1 (fuse)\n')
+    fin.write('* bSta2OverHalfSpan: ' + \
+              "{:10.3f}".format(inputGeo['bSta2OverHalfSpan']) + \
+              ' #Fraction of half span, station 2\n')
+    fin.write('* bSta3OverHalfSpan: ' + \
+              "{:10.3f}".format(inputGeo['bSta3OverHalfSpan']) + \
+              ' #Fraction of half span, station 3\n')
+    fin.write('* bSta4OverHalfSpan: ' + \
+              "{:10.3f}".format(inputGeo['bSta4OverHalfSpan']) + \
+              ' #Fraction of half span, station 4\n')
+    fin.write('* bSta5OverHalfSpan: ' + \
+              "{:10.3f}".format(inputGeo['bSta5OverHalfSpan']) + \
+              ' #Fraction of half span, station 5\n')
+    fin.write('*\n')
+
+    fin.write('*Variation of chord from trapazoidal wing at control stations:\n')
+    fin.write('* ratioCSta1OverCtrap: ' + \
+              "{:10.3f}".format(inputGeo['ratioCSta1OverCtrap']) + \
+              ' #Ratio actual to ref chord, station 1\n')
+    fin.write('* ratioCSta2OverCtrap: ' + \
+              "{:10.3f}".format(inputGeo['ratioCSta2OverCtrap']) + \
+              ' #Ratio actual to ref chord, station 2\n')
+    fin.write('* ratioCSta3OverCtrap: ' + \
+              "{:10.3f}".format(inputGeo['ratioCSta3OverCtrap']) + \
+              ' #Ratio actual to ref chord, station 3\n')
+    fin.write('* ratioCSta4OverCtrap: ' + \
+              "{:10.3f}".format(inputGeo['ratioCSta4OverCtrap']) + \
+              ' #Ratio actual to ref chord, station 4\n')
+    fin.write('* ratioCSta5OverCtrap: ' + \
+              "{:10.3f}".format(inputGeo['ratioCSta5OverCtrap']) + \
+              ' #Ratio actual to ref chord, station 5\n')
+    fin.write('* ratioCSta6OverCtrap: ' + \
+              "{:10.3f}".format(inputGeo['ratioCSta6OverCtrap']) + \
+              ' #Ratio actual to ref chord, station 6\n')
+    fin.write('*\n')
+
+    fin.write('*Variation of sweep from reference value at control stations:\n')
+    fin.write('* sweepIncrDegSta1: ' + \
+              "{:10.3f}".format(inputGeo['sweepIncrDegSta1']) + \
+              ' #Increment in sweep, station 1 to 2\n')
+    fin.write('* sweepIncrDegSta2: ' + \
+              "{:10.3f}".format(inputGeo['sweepIncrDegSta2']) + \
+              ' #Increment in sweep, station 2 to 3\n')
+    fin.write('* sweepIncrDegSta3: ' + \
+              "{:10.3f}".format(inputGeo['sweepIncrDegSta3']) + \
+              ' #Increment in sweep, station 3 to 4\n')
+    fin.write('* sweepIncrDegSta4: ' + \
+              "{:10.3f}".format(inputGeo['sweepIncrDegSta4']) + \
+              ' #Increment in sweep, station 4 to 5\n')
+    fin.write('* sweepIncrDegSta5: ' + \
+              "{:10.3f}".format(inputGeo['sweepIncrDegSta5']) + \
+              ' #Increment in sweep, station 5 to 6\n')
+    fin.write('*\n')
+
+    fin.write('*Incidence at control stations - positive = wash-OUT (TE UP):\n')
+    fin.write('* incidenceDegSta1: ' + \
+              "{:10.3f}".format(inputGeo['incidenceDegSta1']) + \
+              ' #Incidence at station 1\n')
+    fin.write('* incidenceDegSta2: ' + \
+              "{:10.3f}".format(inputGeo['incidenceDegSta2']) + \
+              ' #Incidence at station 2\n')
+    fin.write('* incidenceDegSta3: ' + \
+              "{:10.3f}".format(inputGeo['incidenceDegSta3']) + \
+              ' #Incidence at station 3\n')
+    fin.write('* incidenceDegSta4: ' + \
+              "{:10.3f}".format(inputGeo['incidenceDegSta4']) + \
+              ' #Incidence at station 4\n')
+    fin.write('* incidenceDegSta5: ' + \
+              "{:10.3f}".format(inputGeo['incidenceDegSta5']) + \
+              ' #Incidence at station 5\n')
+    fin.write('* incidenceDegSta6: ' + \
+              "{:10.3f}".format(inputGeo['incidenceDegSta6']) + \
+              ' #Incidence at station 6\n')
+    fin.write('*\n')
+
+    fin.write('*Vertical shear at stations, positive = UP from dihedral line:\n')
+    fin.write('* zShearInInSta1: ' + \
+              "{:10.3f}".format(inputGeo['zShearInInSta1']) + \
+              ' #Vertical displacement at station 1\n')
+    fin.write('* zShearInInSta2: ' + \
+              "{:10.3f}".format(inputGeo['zShearInInSta2']) + \
+              ' #Vertical displacement at station 2\n')
+    fin.write('* zShearInInSta3: ' + \
+              "{:10.3f}".format(inputGeo['zShearInInSta3']) + \
+              ' #Vertical displacement at station 3\n')
+    fin.write('* zShearInInSta4: ' + \
+              "{:10.3f}".format(inputGeo['zShearInInSta4']) + \
+              ' #Vertical displacement at station 4\n')
+    fin.write('* zShearInInSta5: ' + \
+              "{:10.3f}".format(inputGeo['zShearInInSta5']) + \
+              ' #Vertical displacement at station 5\n')
+    fin.write('* zShearInInSta6: ' + \
+              "{:10.3f}".format(inputGeo['zShearInInSta6']) + \
+              ' #Vertical displacement at station 6\n')
+    fin.write('*\n')
+
+    airfoils = [iSta for iSta in range(1, 7)
+                if 'airfoilSta' + str(iSta) in inputGeo]
+    if airfoils:
+        fin.write('*Wing sections at control stations:\n')
+        for iSta in airfoils:
+            section = inputGeo['airfoilSta' + str(iSta)]
+            if not isinstance(section, str):
+                section = 'tabulated'
+            fin.write('* airfoilSta' + str(iSta) + ': ' + section +
+                      ' #Section at station ' + str(iSta) + '\n')
+        fin.write('*\n')
+
+    fin.write('*** FUSELAGE ***\n')
+    fin.write('* heightFuseInIn: ' + \
+              "{:10.3f}".format(inputGeo['heightFuseInIn']) + '\n')
+    fin.write('* lengthFuseInIn: ' + \
+              "{:10.3f}".format(inputGeo['lengthFuseInIn']) + '\n')
+    fin.write('* noseTopAngle: ' + \
+              "{:12.3f}".format(inputGeo['noseTopAngle']) + '\n')
+    fin.write('* noseSideAngle: ' + \
+              "{:11.3f}".format(inputGeo['noseSideAngle']) + ' \n')
+    fin.write('* tailTopAngle: ' + \
+              "{:12.3f}".format(inputGeo['tailTopAngle']) + '\n')
+    fin.write('* tailSideAngle: ' + \
+              "{:11.3f}".format(inputGeo['tailSideAngle']) + '\n')
+    fin.write('*\n')
+
+    fin.write('*** HORIZONTAL TAIL ***\n')
+    fin.write('* isHTailOn: ' + \
+              "{:19d}".format(inputGeo['isHTailOn']) + ' # OFF=0; ON=1\n')
+    fin.write('* mrpMacHTailPct: ' + \
+              "{:14.3f}".format(inputGeo['mrpMacHTailPct']) + '\n')
+    fin.write('* sRefHTailInFt2: ' + \
+              "{:14.3f}".format(inputGeo['sRefHTailInFt2']) + '\n')
+    fin.write('* arHTail: ' + \
+              "{:21.3f}".format(inputGeo['arHTail']) + '\n')
+    fin.write('* taperHTailInDecimal:' + \
+              "{:10.3f}".format(inputGeo['taperHTailInDecimal']) + '\n')
+    fin.write('* sweepLeHTailInDeg: ' + \
+              "{:11.3f}".format(inputGeo['sweepLeHTailInDeg']) + '\n')
+    fin.write('* dihedralHTailInDeg: ' + \
+              "{:10.3f}".format(inputGeo['dihedralHTailInDeg']) + '\n')
+    fin.write('* xDistHTailApexInIn: ' + \
+              "{:10.3f}".format(inputGeo['xDistHTailApexInIn']) + '\n')
+    fin.write('* hTailIncidenceInDeg:' + \
+              "{:10.3f}".format(inputGeo['hTailIncidenceInDeg']) + \
+              ' # Positive = TE down\n')
+    fin.write('*\n')
+
+    fin.write('*** VERTICAL TAIL ***\n')
+    fin.write('* isVTailOn: ' + \
+              "{:19d}".format(inputGeo['isVTailOn']) + \
+              ' # OFF=0; ON,UPPER=1, ON,LOWER=-1\n')
+    fin.write('* mrpMacVTailPct: ' + \
+              "{:14.3f}".format(inputGeo['mrpMacVTailPct']) + '\n')
+    fin.write('* sRefVTailInFt2: ' + \
+              "{:14.3f}".format(inputGeo['sRefVTailInFt2']) + '\n')
+    fin.write('* arVTail: ' + \
+              "{:21.3f}".format(inputGeo['arVTail']) + '\n')
+    fin.write('* taperVTailInDecimal:' + \
+              "{:10.3f}".format(inputGeo['taperVTailInDecimal']) + '\n')
+    fin.write('* sweepLeVTailInDeg: ' + \
+              "{:11.3f}".format(inputGeo['sweepLeVTailInDeg']) + '\n')
+    fin.write('* tiltVTailInDeg: ' + \
+              "{:14.3f}".format(inputGeo['tiltVTailInDeg']) + \
+              ' # Vertical=0, Tilt Out=+, Tilt In=-\n')
+    fin.write('* yDispVTailBaseInIn: ' + \
+              "{:10.3f}".format(inputGeo['yDispVTailBaseInIn']) + \
+              ' # Spanwise location base vertical tail\n')
+    fin.write('* xDistVTailBaseInIn: ' + \
+              "{:10.3f}".format(inputGeo['xDistVTailBaseInIn']) + '\n')
+    fin.write('*\n')
+    fin.write('********* End Echo Parametric Inputs *********\n')
+    fin.write('\n')
+    fin.write('\n')
+    fin.write('********* Begin VORLAX Input Deck *********\n')
+
+
+def _writeConditionCards(fin, mach, alpha, psi, hag):
+    '''
+    See NASA CR BEFORE CHANGING HARDWIRED INPUTS
+
+    '''
+    # Header card (ISOLV ... HAG ...) and the flight condition cards
+    fin.write('*ISOLV       LAX       LAY    REXPAR      ')
+    fin.write('HAG    FLOATX    FLOATY    ITRMAX\n')
+    fin.write('     0         0         1      0.10')
+    fin.write("{:10.2f}".format(hag) + '      0.00      0.00        99\n')
+
+    # MACH AND AoA SWEEP ***************************************
+    # Default: run single AoA & Mach in VORLAX
+    # Pass other conditions of interest, as needed
+    # Mach sweep
+    fin.write('*NMACH          MACH\n')
+    fin.write(_conditionCards(mach))
+    # AoA sweep (AoA in degrees)
+    fin.write('*NALPHA        ALPHA\n')
+    fin.write(_conditionCards(alpha))
+    # **********************************************************
+
+    fin.write('*    LATRL       PSI    PITCHQ     ROLLQ      YAWQ      VINF\n')
+    fin.write("{:10d}".format(1 if psi != 0 else 0) +
+              "{:10.2f}".format(psi) + '      0.00      0.00      0.00' +
+              '       1.0\n')
+
+
+def _wingCamberCards(inputGeo, iSta):
+    # NAP and camber cards of the wing panel from station iSta to iSta + 1
+    # (chord stations for LAX = 0 and RNCV = 15, as hardwired below)
+    rootSection = inputGeo.get('airfoilSta' + str(iSta))
+    tipSection = inputGeo.get('airfoilSta' + str(iSta + 1))
+    if rootSection is None and tipSection is None:
+        return 0, ''
+    return vorAirfoil.napCards(rootSection or 'NACA0000',
+                               tipSection or 'NACA0000')
+
+
+def _writeGeometryCards(fin, inputGeo):
+    # Reference (NPAN ...) card, panels and survey cards
+    geo = deriveGeometry(inputGeo)
+    nPan = 7 + inputGeo['isHTailOn'] + abs(inputGeo['isVTailOn'])
+    fin.write('*NPAN           SREF      CBAR      XBAR      ZBAR     WSPAN\n')
+    fin.write('{:2d}'.format(nPan) +
+              '        ' +
+              "{:10.2f}".format(geo['sRefInIn2']) +
+              "{:10.2f}".format(geo['cMacInIn']) +
+              "{:10.2f}".format(geo['xMrpInIn']) +
+              "{:10.2f}".format(geo['zMrpInIn']) +
+              "{:10.2f}".format(geo['bInIn']) + '\n')
+    fin.write('*\n')
+
+    fin.write('*** FUSELAGE PANELS ***\n')
+    fin.write('*VORLAX inputs for fuselage:\n')
+
+    # Vertical fuselage panel ***
+    fin.write('*       X1        Y1        Z1     CORD1')
+    fin.write(' COMMENT: VERTICAL FUSELAGE PANEL\n')
+    fin.write("{:10.3f}".format(0) +
+              "{:10.3f}".format(0) +
+              "{:10.3f}".format(0) +
+              "{:10.3f}".format(inputGeo['lengthFuseInIn']) + '\n')
+    fin.write('*       X2        Y2        Z2     CORD2\n')
+    fin.write("{:10.3f}".format(geo['xFuseTopEdgeInIn']) +
+              "{:10.3f}".format(0) +
+              "{:10.3f}".format(inputGeo['heightFuseInIn']) +
+              "{:10.3f}".format(geo['chordFuseTopEdgeInIn']) + '\n')
+    fin.write('*     NVOR      RNCV       SPC       PDL\n')
+    fin.write('        10     15.00      1.00      0.00\n')
+    fin.write('*    AINC1     AINC2       ITS       NAP    ')
+    fin.write('IQUANT     ISYNT       NPP\n')
+    fin.write("{:10.5f}".format(0) +
+              "{:10.5f}".format(0) +
+              '         0         0         1         0         0\n')
     fin.write('*\n')
-    fin.write('*VORLAX inputs for Horizontal Tail:\n')
+
+    # Horizontal fuselage panel ***
     fin.write('*       X1        Y1        Z1     CORD1')
-    fin.write(' COMMENT: HORIZONTAL TAIL PANEL\n')
-    fin.write("{:10.3f}".format(xFuseHTailInIn) +
-              "{:10.3f}".format(ySta1InIn) +
+    fin.write(' COMMENT: HORIZONTAL FUSELAGE PANEL\n')
+    fin.write("{:10.3f}".format(0) +
+              "{:10.3f}".format(0) +
               "{:10.3f}".format(0) +
-              "{:10.3f}".format(cFuseHTailInIn * cosHTailIncidence) + '\n')
+              "{:10.3f}".format(inputGeo['lengthFuseInIn']) + '\n')
     fin.write('*       X2        Y2        Z2     CORD2\n')
-    fin.write("{:10.3f}".format(xTipHTailInIn) +
-              "{:10.3f}".format(bOver2HTailInIn) +
-              "{:10.3f}".format(zTipHTailInIn) +
-              "{:10.3f}".format(cTipHTailInIn * cosHTailIncidence) + '\n')
+    fin.write("{:10.3f}".format(geo['xFuseSideEdgeInIn']) +
+              "{:10.3f}".format(geo['ySta1InIn']) +
+              "{:10.3f}".format(0) +
+              "{:10.3f}".format(geo['chordFuseSideEdgeInIn']) + '\n')
     fin.write('*     NVOR      RNCV       SPC       PDL\n')
     fin.write('        10     15.00      1.00      0.00\n')
     fin.write('*    AINC1     AINC2       ITS       NAP    ')
     fin.write('IQUANT     ISYNT       NPP\n')
-    fin.write("{:10.5f}".format(tanHTailIncidence) + 
-          "{:10.5f}".format(tanHTailIncidence) + 
-          '         0        0          2         0         0\n')
+    fin.write("{:10.5f}".format(0) +
+              "{:10.5f}".format(0) +
+              '         0         0         2         0         0\n')
     fin.write('*\n')
 
-# Vertical tail panel *** 
-if inputGeo['isVTailOn'] != 0:
-    fin.write('*** VERTICAL TAIL PANEL ***\n')
-    fin.write('*Derived Geometric Data for Vertical Tail:\n')
-    fin.write('* Span (in):' +
-              "{:15.3f}".format(bVTailInIn) + '\n')
+    # Wing panels
+    fin.write('*** WING PANELS ***\n')
+    fin.write('*Derived Geometric Data for Reference Wing:\n')
+    fin.write('* Wing Span (in):' +
+              "{:10.3f}".format(geo['bInIn']) + '\n')
     fin.write('* Root Chord (in):' +
-              "{:9.3f}".format(cRootVTailInIn) + '\n')
+              "{:9.3f}".format(geo['cRootInIn']) + '\n')
     fin.write('* Tip Chord (in):' +
-              "{:10.3f}".format(cTipVTailInIn) + '\n')
+              "{:10.3f}".format(geo['cTipInIn']) + '\n')
     fin.write('* MAC Chord (in):' +
-              "{:10.3f}".format(cMacVTailInIn) + '\n')
+              "{:10.3f}".format(geo['cMacInIn']) + '\n')
     fin.write('* x MRP (in):' +
-              "{:14.3f}".format(xMrpVTailInIn) + '\n')
-    fin.write('* z MAC (in):' +
-              "{:14.3f}".format(zMacVTailInIn) + '\n')
+              "{:14.3f}".format(geo['xMrpInIn']) + '\n')
+    fin.write('* z MRP (in):' +
+              "{:14.3f}".format(geo['zMrpInIn']) + '\n')
+    fin.write('* y (in):' +
+              "{:18.3f}".format(geo['yMacInIn']) + '\n')
     fin.write('* Sweep 1/4C (deg):' +
-              "{:8.3f}".format(sweepQtrChordVTailWingInDeg) + '\n')
-    fin.write('* Tail Volume Coefficient:' + 
-              "{:12.5f}".format(vTailVolCoeff) + '\n')
+              "{:8.3f}".format(geo['sweepQtrChordWingInDeg']) + '\n')
     fin.write('*\n')
-    fin.write('*VORLAX inputs for Vertical Tail:\n')
+    fin.write('*VORLAX inputs for Wing:\n')
+
+    # Inboard-most wing panel ***
     fin.write('*       X1        Y1        Z1     CORD1')
-    fin.write(' COMMENT: VERTICAL TAIL PANEL\n')
-    fin.write("{:10.3f}".format(inputGeo['xDistVTailBaseInIn']) +
-              "{:10.3f}".format(inputGeo['yDispVTailBaseInIn']) +
-              "{:10.3f}".format(zBaseVTailInIn) +
-              "{:10.3f}".format(cRootVTailInIn) + '\n')
+    fin.write(' COMMENT: INBOARD-MOST WING PANEL\n')
+    fin.write("{:10.3f}".format(geo['xWingFuseInIn']) +
+              "{:10.3f}".format(geo['ySta1InIn']) +
+              "{:10.3f}".format(geo['zSta1InIn']) +
+              "{:10.3f}".format(geo['chordSta1InIn']) + '\n')
     fin.write('*       X2        Y2        Z2     CORD2\n')
-    fin.write("{:10.3f}".format(xTipVTailInIn) +
-              "{:10.3f}".format(yTipVTailInIn) +
-              "{:10.3f}".format(zTipVTailInIn) +
-              "{:10.3f}".format(cTipVTailInIn) + '\n')
+    fin.write("{:10.3f}".format(geo['xSta2InIn']) +
+              "{:10.3f}".format(geo['ySta2InIn']) +
+              "{:10.3f}".format(geo['zSta2InIn']) +
+              "{:10.3f}".format(geo['chordSta2InIn']) + '\n')
     fin.write('*     NVOR      RNCV       SPC       PDL\n')
     fin.write('        10     15.00      1.00      0.00\n')
     fin.write('*    AINC1     AINC2       ITS       NAP    ')
     fin.write('IQUANT     ISYNT       NPP\n')
-    fin.write("{:10.5f}".format(0) +
-              "{:10.5f}".format(0) +
-              '         0         0' +
-              "{:10d}".format(iQuantVTail) +
-              '         0         0\n')
-
-# Stations that define survey grid (0=No survey, not used)
-fin.write('*\n')
-fin.write('* NXS   NYS   NZS\n')
-fin.write('     0       0      0\n')
-fin.write('* END\n')
-fin.write('********* End VORLAX Input Deck *********\n')
-fin.close()
\ No newline at end of file
+    nap, camberCards = _wingCamberCards(inputGeo, 1)
+    fin.write("{:10.5f}".format(math.tan(inputGeo['incidenceDegSta1'] * degToRad))+
+             "{:10.5f}".format(math.tan(inputGeo['incidenceDegSta2'] * degToRad)) +
+             '         0' + "{:9d}".format(nap) +
+             '          2         0         0\n')
+    fin.write(camberCards)
+    fin.write('*\n')
+
+    # Second-most inboard wing panel ***
+    fin.write('*       X1        Y1        Z1     CORD1')
+    fin.write(' COMMENT: SECOND INBOARD WING PANEL\n')
+    fin.write("{:10.3f}".format(geo['xSta2InIn']) +
+              "{:10.3f}".format(geo['ySta2InIn']) +
+              "{:10.3f}".format(geo['zSta2InIn']) +
+              "{:10.3f}".format(geo['chordSta2InIn']) + '\n')
+    fin.write('*       X2        Y2        Z2     CORD2\n')
+    fin.write("{:10.3f}".format(geo['xSta3InIn']) + \
+              "{:10.3f}".format(geo['ySta3InIn']) +
+              "{:10.3f}".format(geo['zSta3InIn']) +
+              "{:10.3f}".format(geo['chordSta3InIn']) + '\n')
+    fin.write('*     NVOR      RNCV       SPC       PDL\n')
+    fin.write('        10     15.00      1.00      0.00\n')
+    fin.write('*    AINC1     AINC2       ITS       NAP    ')
+    fin.write('IQUANT     ISYNT       NPP\n')
+    nap, camberCards = _wingCamberCards(inputGeo, 2)
+    fin.write("{:10.5f}".format(math.tan(inputGeo['incidenceDegSta2'] * degToRad))+
+             "{:10.5f}".format(math.tan(inputGeo['incidenceDegSta3'] * degToRad)) +
+             '         0' + "{:9d}".format(nap) +
+             '          2         0         0\n')
+    fin.write(camberCards)
+    fin.write('*\n')
+
+    # Middle wing panel ***
+    fin.write('*       X1        Y1        Z1     CORD1')
+    fin.write(' COMMENT: MIDDLE WING PANEL\n')
+    fin.write("{:10.3f}".format(geo['xSta3InIn']) +
+              "{:10.3f}".format(geo['ySta3InIn']) +
+              "{:10.3f}".format(geo['zSta3InIn']) +
+              "{:10.3f}".format(geo['chordSta3InIn']) + '\n')
+    fin.write('*       X2        Y2        Z2     CORD2\n')
+    fin.write("{:10.3f}".format(geo['xSta4InIn']) +
+              "{:10.3f}".format(geo['ySta4InIn']) +
+              "{:10.3f}".format(geo['zSta4InIn']) +
+              "{:10.3f}".format(geo['chordSta4InIn']) + '\n')
+    fin.write('*     NVOR      RNCV       SPC       PDL\n')
+    fin.write('        10     15.00      1.00      0.00\n')
+    fin.write('*    AINC1     AINC2       ITS       NAP    ')
+    fin.write('IQUANT     ISYNT       NPP\n')
+    nap, camberCards = _wingCamberCards(inputGeo, 3)
+    fin.write("{:10.5f}".format(math.tan(inputGeo['incidenceDegSta3'] * degToRad))+
+             "{:10.5f}".format(math.tan(inputGeo['incidenceDegSta4'] * degToRad)) +
+             '         0' + "{:9d}".format(nap) +
+             '          2         0         0\n')
+    fin.write(camberCards)
+    fin.write('*\n')
+
+    # Second-most outboard wing panel ***
+    fin.write('*       X1        Y1        Z1     CORD1')
+    fin.write(' COMMENT: SECOND-MOST OUTBOARD WING PANEL\n')
+    fin.write("{:10.3f}".format(geo['xSta4InIn']) +
+              "{:10.3f}".format(geo['ySta4InIn']) +
+              "{:10.3f}".format(geo['zSta4InIn']) +
+              "{:10.3f}".format(geo['chordSta4InIn']) + '\n')
+    fin.write('*       X2        Y2        Z2     CORD2\n')
+    fin.write("{:10.3f}".format(geo['xSta5InIn']) +
+              "{:10.3f}".format(geo['ySta5InIn']) +
+              "{:10.3f}".format(geo['zSta5InIn']) +
+              "{:10.3f}".format(geo['chordSta5InIn']) + '\n')
+    fin.write('*     NVOR      RNCV       SPC       PDL\n')
+    fin.write('        10     15.00      1.00      0.00\n')
+    fin.write('*    AINC1     AINC2       ITS       NAP    ')
+    fin.write('IQUANT     ISYNT       NPP\n')
+    nap, camberCards = _wingCamberCards(inputGeo, 4)
+    fin.write("{:10.5f}".format(math.tan(inputGeo['incidenceDegSta4'] * degToRad))+
+             "{:10.5f}".format(math.tan(inputGeo['incidenceDegSta5'] * degToRad)) +
+             '         0' + "{:9d}".format(nap) +
+             '          2         0         0\n')
+    fin.write(camberCards)
+    fin.write('*\n')
+
+    # Outboard-most wing panel ***
+    fin.write('*       X1        Y1        Z1     CORD1')
+    fin.write(' COMMENT: MOST OUTBOARD WING PANEL\n')
+    fin.write("{:10.3f}".format(geo['xSta5InIn']) +
+              "{:10.3f}".format(geo['ySta5InIn']) +
+              "{:10.3f}".format(geo['zSta5InIn']) +
+              "{:10.3f}".format(geo['chordSta5InIn']) + '\n')
+    fin.write('*       X2        Y2        Z2     CORD2\n')
+    fin.write("{:10.3f}".format(geo['xSta6InIn']) +
+              "{:10.3f}".format(geo['ySta6InIn']) +
+              "{:10.3f}".format(geo['zSta6InIn']) +
+              "{:10.3f}".format(geo['chordSta6InIn']) + '\n')
+    fin.write('*     NVOR      RNCV       SPC       PDL\n')
+    fin.write('        10     15.00      1.00      0.00\n')
+    fin.write('*    AINC1     AINC2       ITS       NAP    ')
+    fin.write('IQUANT     ISYNT       NPP\n')
+    nap, camberCards = _wingCamberCards(inputGeo, 5)
+    fin.write("{:10.5f}".format(math.tan(inputGeo['incidenceDegSta5'] * degToRad))+
+             "{:10.5f}".format(math.tan(inputGeo['incidenceDegSta6'] * degToRad)) +
+             '         0' + "{:9d}".format(nap) +
+             '          2         0         0\n')
+    fin.write(camberCards)
+    fin.write('*\n')
+
+    # Horizontal tail panel ***
+    if inputGeo['isHTailOn'] != 0:
+        fin.write('*** HORIZONTAL TAIL PANEL ***\n')
+        fin.write('*Derived Geometric Data for Horizontal Tail:\n')
+        fin.write('* Span (in):' +
+                  "{:15.3f}".format(geo['bHTailInIn']) + '\n')
+        fin.write('* Root Chord (in):' +
+                  "{:9.3f}".format(geo['cRootHTailInIn']) + '\n')
+        fin.write('* Tip Chord (in):' +
+                  "{:10.3f}".format(geo['cTipHTailInIn']) + '\n')
+        fin.write('* MAC Chord (in):' +
+                  "{:10.3f}".format(geo['cMacHTailInIn']) + '\n')
+        fin.write('* x MRP (in):' +
+                  "{:14.3f}".format(geo['xMrpHTailInIn']) + '\n')
+        fin.write('* y MAC (in):' +
+                  "{:14.3f}".format(geo['yMacHTailInIn']) + '\n')
+        fin.write('* Sweep 1/4C (deg):' +
+                  "{:8.3f}".format(geo['sweepQtrChordHTailWingInDeg']) + '\n')
+        fin.write('* Tail Volume Coefficient:' +
+                  "{:12.5f}".format(geo['hTailVolCoeff']) + '\n')
+        fin.write('*\n')
+        fin.write('*VORLAX inputs for Horizontal Tail:\n')
+        fin.write('*       X1        Y1        Z1     CORD1')
+        fin.write(' COMMENT: HORIZONTAL TAIL PANEL\n')
+        fin.write("{:10.3f}".format(geo['xFuseHTailInIn']) +
+                  "{:10.3f}".format(geo['ySta1InIn']) +
+                  "{:10.3f}".format(0) +
+                  "{:10.3f}".format(geo['cFuseHTailInIn'] *
+                                    geo['cosHTailIncidence']) + '\n')
+        fin.write('*       X2        Y2        Z2     CORD2\n')
+        fin.write("{:10.3f}".format(geo['xTipHTailInIn']) +
+                  "{:10.3f}".format(geo['bOver2HTailInIn']) +
+                  "{:10.3f}".format(geo['zTipHTailInIn']) +
+                  "{:10.3f}".format(geo['cTipHTailInIn'] *
+                                    geo['cosHTailIncidence']) + '\n')
+        fin.write('*     NVOR      RNCV       SPC       PDL\n')
+        fin.write('        10     15.00      1.00      0.00\n')
+        fin.write('*    AINC1     AINC2       ITS       NAP    ')
+        fin.write('IQUANT     ISYNT       NPP\n')
+        fin.write("{:10.5f}".format(geo['tanHTailIncidence']) +
+              "{:10.5f}".format(geo['tanHTailIncidence']) +
+              '         0        0          2         0         0\n')
+        fin.write('*\n')
+
+    # Vertical tail panel ***
+    if inputGeo['isVTailOn'] != 0:
+        fin.write('*** VERTICAL TAIL PANEL ***\n')
+        fin.write('*Derived Geometric Data for Vertical Tail:\n')
+        fin.write('* Span (in):' +
+                  "{:15.3f}".format(geo['bVTailInIn']) + '\n')
+        fin.write('* Root Chord (in):' +
+                  "{:9.3f}".format(geo['cRootVTailInIn']) + '\n')
+        fin.write('* Tip Chord (in):' +
+                  "{:10.3f}".format(geo['cTipVTailInIn']) + '\n')
+        fin.write('* MAC Chord (in):' +
+                  "{:10.3f}".format(geo['cMacVTailInIn']) + '\n')
+        fin.write('* x MRP (in):' +
+                  "{:14.3f}".format(geo['xMrpVTailInIn']) + '\n')
+        fin.write('* z MAC (in):' +
+                  "{:14.3f}".format(geo['zMacVTailInIn']) + '\n')
+        fin.write('* Sweep 1/4C (deg):' +
+                  "{:8.3f}".format(geo['sweepQtrChordVTailWingInDeg']) + '\n')
+        fin.write('* Tail Volume Coefficient:' +
+                  "{:12.5f}".format(geo['vTailVolCoeff']) + '\n')
+        fin.write('*\n')
+        fin.write('*VORLAX inputs for Vertical Tail:\n')
+        fin.write('*       X1        Y1        Z1     CORD1')
+        fin.write(' COMMENT: VERTICAL TAIL PANEL\n')
+        fin.write("{:10.3f}".format(inputGeo['xDistVTailBaseInIn']) +
+                  "{:10.3f}".format(inputGeo['yDispVTailBaseInIn']) +
+                  "{:10.3f}".format(geo['zBaseVTailInIn']) +
+                  "{:10.3f}".format(geo['cRootVTailInIn']) + '\n')
+        fin.write('*       X2        Y2        Z2     CORD2\n')
+        fin.write("{:10.3f}".format(geo['xTipVTailInIn']) +
+                  "{:10.3f}".format(geo['yTipVTailInIn']) +
+                  "{:10.3f}".format(geo['zTipVTailInIn']) +
+                  "{:10.3f}".format(geo['cTipVTailInIn']) + '\n')
+        fin.write('*     NVOR      RNCV       SPC       PDL\n')
+        fin.write('        10     15.00      1.00      0.00\n')
+        fin.write('*    AINC1     AINC2       ITS       NAP    ')
+        fin.write('IQUANT     ISYNT       NPP\n')
+        fin.write("{:10.5f}".format(0) +
+                  "{:10.5f}".format(0) +
+                  '         0         0' +
+                  "{:10d}".format(geo['iQuantVTail']) +
+                  '         0         0\n')
+
+    # Stations that define survey grid (0=No survey, not used)
+    fin.write('*\n')
+    fin.write('* NXS   NYS   NZS\n')
+    fin.write('     0       0      0\n')
+    fin.write('* END\n')
+    fin.write('********* End VORLAX Input Deck *********\n')
+
+
+# Echo and geometry text of recently written decks, by caseHash of
+# inputGeo, so decks that only differ in conditions reuse them
+_cardCache = collections.OrderedDict()
+_cardCacheSize = 256
+
+
+def _cachedCards(inputGeo):
+    h = caseHash(inputGeo)
+    if h in _cardCache:
+        _cardCache.move_to_end(h)
+        return _cardCache[h]
+    echo, geometry = io.StringIO(), io.StringIO()
+    _writeEchoInputs(echo, inputGeo)
+    _writeGeometryCards(geometry, inputGeo)
+    _cardCache[h] = echo.getvalue(), geometry.getvalue()
+    if len(_cardCache) > _cardCacheSize:
+        _cardCache.popitem(last=False)
+    return _cardCache[h]
+
+
+def writeVorlaxInput(fin, inputGeo, mach=(0.2,), alpha=(0.0,), psi=0.0,
+                     hag=0.0):
+    """Write the VORLAX input deck for inputGeo to the open file fin.
+
+    The deck runs every combination of the mach and alpha (deg) lists at
+    sideslip psi (deg, sets LATRL when nonzero) and height above ground
+    hag (in, 0 = no ground effect). The echo and geometry cards are
+    cached by inputGeo, so decks that differ only in conditions are cheap.
+    """
+    echo, geometry = _cachedCards(inputGeo)
+    fin.write(echo)
+    _writeConditionCards(fin, mach, alpha, psi, hag)
+    fin.write(geometry)
+
+
+def vorlaxDeck(inputGeo, **conditions):
+    """Return the VORLAX input deck for inputGeo as a string (conditions
+    as for writeVorlaxInput)."""
+    fin = io.StringIO()
+    writeVorlaxInput(fin, inputGeo, **conditions)
+    return fin.getvalue()
+
+
+if __name__ == '__main__':
+    # Open input file for write
+    fin = open(vorlaxInputPath(), 'w')
+    writeVorlaxInput(fin, inputGeo)
+    fin.close()
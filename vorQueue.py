@@ -0,0 +1,378 @@
+'''
+VorQueue
+
+Shared-filesystem work queue for spreading VorModel cases over several
+worker processes or nodes. The queue is a plain directory (local disk or
+an NFS-style share) that every worker can see:
+
+queueDir/pending/<hash>.json                   cases waiting for a worker
+queueDir/claimed/<hash>.<worker>.reserved.json prefetched, not yet started
+queueDir/claimed/<hash>.<worker>.running.json  being run, mtime = lease
+queueDir/done/<hash>.json                      finished cases
+queueDir/failed/<hash>.json (+ .log)           cases whose run raised
+queueDir/results/<hash>/                       files left by the run
+
+A case is a dict holding an inputGeo dictionary (see "vorModel") and,
+optionally, run conditions passed on to vorModel.writeVorlaxInput, i.e.
+{'inputGeo': {...}, 'conditions': {'mach': [...], 'alpha': [...]}}. It
+is named by vorModel.caseHash(case).
+
+Every state change is a single os.rename, which is atomic on POSIX and
+NFS, so two workers can never own the same case. A running worker touches
+its claimed file every leaseSec / 3 seconds; a claim whose mtime is older
+than leaseSec belongs to a dead worker and is put back in pending. Idle
+workers steal cases other workers have reserved but not started, so a
+slow node never holds up the tail of a sweep. Worker clocks should be
+roughly in sync (NTP) for lease expiry to be meaningful.
+
+Each case runs in a scratch directory: vorlax.in is written there and, if
+exeCmd is given, the Vorlax executable is run there. Everything left in
+the scratch directory is then moved to results/<hash>/. With archiveDir
+set, the case and its files are instead appended to the worker's shards
+of a "vorArchive" archive and the scratch directory is removed, so a
+finished case leaves no per-case files in the queue at all.
+
+Try it with several local processes on one box:
+python vorQueue.py enqueue myQueue
+python vorQueue.py work myQueue --nproc 4 [--archive myArchive]
+python vorQueue.py status myQueue
+'''
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import traceback
+
+import vorArchive
+import vorModel
+
+STATES = ('pending', 'claimed', 'done', 'failed', 'results', 'tmp')
+
+
+def workerName():
+    """Return a name for this worker process that is unique across nodes."""
+    host = socket.gethostname().split('.')[0].replace('_', '-')
+    return host + '-' + str(os.getpid())
+
+
+def initQueue(queueDir):
+    """Create the queue directory layout (safe to call repeatedly)."""
+    for state in STATES:
+        os.makedirs(os.path.join(queueDir, state), exist_ok=True)
+
+
+def _hashOf(fileName):
+    return fileName.split('.', 1)[0]
+
+
+def _knownHashes(queueDir):
+    known = set()
+    for state in ('pending', 'claimed', 'done', 'failed'):
+        for fileName in os.listdir(os.path.join(queueDir, state)):
+            known.add(_hashOf(fileName))
+    return known
+
+
+def _archived(archiveDir, archived):
+    # Hashes already in the archive: archived (a set of hashes or an
+    # ArchiveIndex) if given, else read from archiveDir
+    if archived is not None:
+        return archived
+    if archiveDir is not None and os.path.isdir(archiveDir):
+        return vorArchive.archivedHashes(archiveDir)
+    return set()
+
+
+def enqueue(queueDir, cases, archiveDir=None, archived=None):
+    """Add cases to the queue, skipping any already queued or finished
+    (including cases already stored in archiveDir, if given).
+
+    archived, a set of case hashes or an ArchiveIndex of archiveDir, saves
+    re-reading the archive index when enqueueing in several calls.
+
+    Returns the list of case hashes, in the order of cases.
+    """
+    initQueue(queueDir)
+    known = _knownHashes(queueDir)
+    archived = _archived(archiveDir, archived)
+    hashes = []
+    for case in cases:
+        h = vorModel.caseHash(case)
+        hashes.append(h)
+        if h in known or h in archived:
+            continue
+        known.add(h)
+        # Write to tmp then rename, so workers never see a partial file
+        tmpPath = os.path.join(queueDir, 'tmp', h + '.' + workerName())
+        with open(tmpPath, 'w') as fout:
+            json.dump(case, fout, sort_keys=True)
+        os.rename(tmpPath, os.path.join(queueDir, 'pending', h + '.json'))
+    return hashes
+
+
+def status(queueDir, archiveDir=None, archived=None):
+    """Return a dict with the number of cases in each state (cases
+    stored in archiveDir, if given, count as done; archived as for
+    enqueue)."""
+    counts = {'pending': 0, 'reserved': 0, 'running': 0, 'done': 0,
+              'failed': 0}
+    counts['done'] += len(_archived(archiveDir, archived))
+    for fileName in os.listdir(os.path.join(queueDir, 'pending')):
+        counts['pending'] += 1
+    for fileName in os.listdir(os.path.join(queueDir, 'claimed')):
+        counts[fileName.rsplit('.', 2)[1]] += 1
+    for state in ('done', 'failed'):
+        for fileName in os.listdir(os.path.join(queueDir, state)):
+            if fileName.endswith('.json'):
+                counts[state] += 1
+    return counts
+
+
+def writeDeck(case, workDir):
+    """Default case runner: write vorlax.in for the case into workDir."""
+    fin = open(os.path.join(workDir, 'vorlax.in'), 'w')
+    vorModel.writeVorlaxInput(fin, case['inputGeo'],
+                              **case.get('conditions', {}))
+    fin.close()
+
+
+def _tryRename(src, dst):
+    # Losing a race to another worker shows up as the source having gone
+    try:
+        os.rename(src, dst)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _claim(src, dst):
+    # Rename keeps the old mtime, so start a fresh lease on the new claim
+    if not _tryRename(src, dst):
+        return False
+    try:
+        os.utime(dst)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def requeueExpired(queueDir, leaseSec):
+    """Put claims whose lease is older than leaseSec back in pending.
+
+    Returns the number of cases requeued.
+    """
+    claimedDir = os.path.join(queueDir, 'claimed')
+    now = time.time()
+    nRequeued = 0
+    for fileName in os.listdir(claimedDir):
+        path = os.path.join(claimedDir, fileName)
+        try:
+            age = now - os.stat(path).st_mtime
+        except FileNotFoundError:
+            continue
+        if age > leaseSec and _tryRename(path, os.path.join(
+                queueDir, 'pending', _hashOf(fileName) + '.json')):
+            nRequeued += 1
+    return nRequeued
+
+
+def _reserve(queueDir, worker, nWanted):
+    # Claim up to nWanted pending cases, in random order so that workers
+    # starting together don't all fight over the same first file
+    pendingDir = os.path.join(queueDir, 'pending')
+    fileNames = os.listdir(pendingDir)
+    random.shuffle(fileNames)
+    reserved = []
+    for fileName in fileNames:
+        if len(reserved) >= nWanted:
+            break
+        claimedPath = os.path.join(queueDir, 'claimed', _hashOf(fileName) +
+                                   '.' + worker + '.reserved.json')
+        if _claim(os.path.join(pendingDir, fileName), claimedPath):
+            reserved.append(claimedPath)
+    return reserved
+
+
+def _steal(queueDir, worker):
+    # Take one case another worker has reserved but not yet started
+    claimedDir = os.path.join(queueDir, 'claimed')
+    fileNames = [f for f in os.listdir(claimedDir)
+                 if f.endswith('.reserved.json') and
+                 f.split('.')[1] != worker]
+    random.shuffle(fileNames)
+    for fileName in fileNames:
+        runningPath = os.path.join(claimedDir, _hashOf(fileName) + '.' +
+                                   worker + '.running.json')
+        if _claim(os.path.join(claimedDir, fileName), runningPath):
+            return runningPath
+    return None
+
+
+def _heartbeat(path, leaseSec, stop):
+    # Refresh the lease on a running case until stop is set
+    while not stop.wait(leaseSec / 3):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return
+
+
+def _runClaimed(queueDir, runningPath, runCase, exeCmd, leaseSec,
+                archive=None):
+    h = _hashOf(os.path.basename(runningPath))
+    try:
+        with open(runningPath) as fin:
+            case = json.load(fin)
+    except FileNotFoundError:
+        # Lost the claim to a worker that saw its pre-rename mtime
+        return False
+    stop = threading.Event()
+    beat = threading.Thread(target=_heartbeat,
+                            args=(runningPath, leaseSec, stop), daemon=True)
+    beat.start()
+    workDir = tempfile.mkdtemp(prefix='vor-' + h[:12] + '-',
+                               dir=os.path.join(queueDir, 'tmp'))
+    try:
+        runCase(case, workDir)
+        if exeCmd:
+            with open(os.path.join(workDir, 'vorlax.log'), 'w') as flog:
+                subprocess.run(exeCmd, cwd=workDir, stdout=flog,
+                               stderr=subprocess.STDOUT, check=True)
+    except Exception:
+        stop.set()
+        with open(os.path.join(queueDir, 'failed', h + '.log'), 'w') as flog:
+            flog.write(traceback.format_exc())
+        _tryRename(runningPath, os.path.join(queueDir, 'failed', h + '.json'))
+        shutil.rmtree(workDir, ignore_errors=True)
+        return False
+    stop.set()
+    if archive is not None:
+        with open(os.path.join(workDir, 'case.json'), 'w') as fout:
+            json.dump(case, fout, sort_keys=True)
+        archive.addDir(h, workDir)
+        shutil.rmtree(workDir, ignore_errors=True)
+        try:
+            os.remove(runningPath)
+        except FileNotFoundError:
+            pass
+        return True
+    resultDir = os.path.join(queueDir, 'results', h)
+    # A case re-run after a lease expiry may already have results
+    if os.path.isdir(resultDir):
+        shutil.rmtree(workDir, ignore_errors=True)
+    else:
+        try:
+            os.rename(workDir, resultDir)
+        except OSError:
+            shutil.rmtree(workDir, ignore_errors=True)
+    _tryRename(runningPath, os.path.join(queueDir, 'done', h + '.json'))
+    return True
+
+
+def work(queueDir, runCase=writeDeck, exeCmd=None, leaseSec=600.,
+         prefetch=2, pollSec=5., archiveDir=None):
+    """Run cases from the queue until no work is left anywhere.
+
+    runCase(case, workDir) prepares the case in workDir (default: write
+    vorlax.in); exeCmd, if given, is then run in workDir (e.g. the path of
+    the Vorlax exe). Up to prefetch cases are reserved at a time. While
+    other workers still hold live claims, waits pollSec between checks so
+    that cases of workers that die get picked up after leaseSec. With
+    archiveDir, finished cases are stored in a "vorArchive" archive
+    rather than in results/<hash>/ and done/.
+
+    Returns the number of cases this worker finished.
+    """
+    initQueue(queueDir)
+    worker = workerName()
+    archive = None
+    if archiveDir is not None:
+        archive = vorArchive.ArchiveWriter(archiveDir, worker)
+    try:
+        return _workLoop(queueDir, worker, runCase, exeCmd, leaseSec,
+                         prefetch, pollSec, archive)
+    finally:
+        if archive is not None:
+            archive.close()
+
+
+def _workLoop(queueDir, worker, runCase, exeCmd, leaseSec, prefetch,
+              pollSec, archive):
+    nDone = 0
+    while True:
+        requeueExpired(queueDir, leaseSec)
+        claimedDir = os.path.join(queueDir, 'claimed')
+        mine = sorted(f for f in os.listdir(claimedDir)
+                      if f.split('.')[1] == worker and
+                      f.endswith('.reserved.json'))
+        if not mine:
+            mine = [os.path.basename(p)
+                    for p in _reserve(queueDir, worker, prefetch)]
+        runningPath = None
+        for fileName in mine:
+            candidate = os.path.join(claimedDir, _hashOf(fileName) + '.' +
+                                     worker + '.running.json')
+            if _claim(os.path.join(claimedDir, fileName), candidate):
+                runningPath = candidate
+                break
+        if runningPath is None:
+            runningPath = _steal(queueDir, worker)
+        if runningPath is not None:
+            nDone += _runClaimed(queueDir, runningPath, runCase, exeCmd,
+                                 leaseSec, archive)
+            continue
+        if not os.listdir(claimedDir):
+            return nDone
+        time.sleep(pollSec)
+
+
+def _workMain(args):
+    queueDir, exeCmd, leaseSec, prefetch, archiveDir = args
+    return work(queueDir, exeCmd=exeCmd, leaseSec=leaseSec,
+                prefetch=prefetch, archiveDir=archiveDir)
+
+
+def spawnWorkers(queueDir, nProc, exeCmd=None, leaseSec=600., prefetch=2,
+                 archiveDir=None):
+    """Run nProc local worker processes on the queue and wait for them.
+
+    Returns the number of cases finished by each worker.
+    """
+    pool = multiprocessing.Pool(nProc)
+    try:
+        return pool.map(_workMain, [(queueDir, exeCmd, leaseSec, prefetch,
+                                     archiveDir)] * nProc)
+    finally:
+        pool.close()
+        pool.join()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='VorModel work queue')
+    parser.add_argument('action', choices=['enqueue', 'work', 'status'])
+    parser.add_argument('queueDir')
+    parser.add_argument('--exe', help='Vorlax command to run in each case')
+    parser.add_argument('--nproc', type=int, default=1)
+    parser.add_argument('--lease', type=float, default=600.)
+    parser.add_argument('--prefetch', type=int, default=2)
+    parser.add_argument('--archive', help='store finished cases in this '
+                        'vorArchive directory')
+    args = parser.parse_args()
+    if args.action == 'enqueue':
+        # Queue the case defined by the inputGeo dictionary in vorModel
+        hashes = enqueue(args.queueDir, [{'inputGeo': vorModel.inputGeo}],
+                         args.archive)
+        print('\n'.join(hashes))
+    elif args.action == 'work':
+        exeCmd = [args.exe] if args.exe else None
+        print(spawnWorkers(args.queueDir, args.nproc, exeCmd, args.lease,
+                           args.prefetch, args.archive))
+    else:
+        print(status(args.queueDir, args.archive))
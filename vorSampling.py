@@ -0,0 +1,184 @@
+'''
+VorSampling
+
+Adaptive sampling of run conditions (Mach, AoA, sideslip and height above
+ground) for a VorModel geometry. Instead of a uniform grid picked by
+hand, start from a coarse set of values per axis and add points only
+where the coefficients are not yet resolved by interpolation, e.g. near
+compressibility onset or where ground effect (HAG) starts to bite.
+
+The conditions stay a tensor grid, which is what a VORLAX deck runs: one
+deck solves every MACH x ALPHA combination for a single PSI and HAG. So a
+new alpha costs no extra decks, a new Mach adds one Mach to the decks, and
+only new PSI or HAG values add decks. New points of each pass are
+batched into as few multi-condition decks as possible.
+
+Error estimate: for each interval of each axis, along every grid line in
+that direction, the midpoint value of linear interpolation is compared to
+that of the quadratic through the interval and its left or right
+neighbor; the interval is bisected if the larger difference exceeds tol
+for any coefficient (and the interval is wider than 2 * minStep).
+HAG 0 (no ground effect) stays out of the refinement of the HAG axis,
+and heights are only refined down to the lowest one allowed by
+vorModel.checkGroundHeights.
+
+The solver is supplied by the caller: solveDeck(deckText) runs VORLAX on
+a deck and returns {(mach, alpha): {'CL': ..., 'CM': ..., ...}} for the
+conditions in the deck, keyed by the values as written to the deck (see
+DIGITS). It must be a module level function if nProc > 1.
+'''
+import multiprocessing
+
+import vorModel
+
+AXES = ('mach', 'alpha', 'psi', 'hag')
+# Decimals each axis is written to the deck with
+DIGITS = {'mach': 4, 'alpha': 4, 'psi': 2, 'hag': 2}
+
+
+def solveDecks(decks, solveDeck, nProc=1):
+    """Return [solveDeck(deck) for deck in decks], run over nProc local
+    processes."""
+    if nProc <= 1 or len(decks) <= 1:
+        return [solveDeck(deck) for deck in decks]
+    pool = multiprocessing.Pool(min(nProc, len(decks)))
+    try:
+        return pool.map(solveDeck, decks)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def batchConditions(points):
+    """Group condition points (mach, alpha, psi, hag) into deck conditions.
+
+    Returns a list of condition dicts (as for vorModel.writeVorlaxInput),
+    one per deck, whose MACH x ALPHA grids together cover exactly the
+    points. Machs that need the same alphas at a PSI and HAG share a deck.
+    """
+    alphasOf = {}
+    for mach, alpha, psi, hag in points:
+        alphasOf.setdefault((psi, hag), {}).setdefault(mach, set()).add(
+            alpha)
+    batches = []
+    for (psi, hag), byMach in sorted(alphasOf.items()):
+        machsOf = {}
+        for mach, alphas in byMach.items():
+            machsOf.setdefault(tuple(sorted(alphas)), []).append(mach)
+        for alphas, machs in sorted(machsOf.items()):
+            batches.append({'mach': sorted(machs), 'alpha': list(alphas),
+                            'psi': psi, 'hag': hag})
+    return batches
+
+
+def _midError(xs, ys, i):
+    # Largest difference at the midpoint of [xs[i], xs[i+1]] between the
+    # linear interpolant and the quadratics using a neighbor point
+    xMid = (xs[i] + xs[i + 1]) / 2
+    linear = (ys[i] + ys[i + 1]) / 2
+    error = 0
+    for j in (i - 1, i + 2):
+        if 0 <= j < len(xs):
+            k = [i, i + 1, j]
+            quad = 0
+            for a in k:
+                weight = ys[a]
+                for b in k:
+                    if b != a:
+                        weight *= (xMid - xs[b]) / (xs[a] - xs[b])
+                quad += weight
+            error = max(error, abs(quad - linear))
+    return error
+
+
+def _refineAxis(axis, grid, results, tol, minStep, hagMin=0.):
+    # Return the midpoints to add to grid[axis]. HAG 0 (free air) is
+    # infinitely high, not the lowest height, so it is not refined, nor
+    # are heights that would put the geometry below the ground (hagMin)
+    n = AXES.index(axis)
+    xs = grid[axis]
+    if axis == 'hag':
+        xs = [x for x in xs if x > 0]
+    others = [grid[a] for a in AXES if a != axis]
+    lines = [[]]
+    for values in others:
+        lines = [line + [v] for line in lines for v in values]
+    newValues = []
+    for i in range(len(xs) - 1):
+        xMid = round((xs[i] + xs[i + 1]) / 2, DIGITS[axis])
+        if xs[i + 1] - xs[i] < 2 * minStep.get(axis, 0) or \
+           xMid in (xs[i], xs[i + 1]) or (axis == 'hag' and xMid < hagMin):
+            continue
+        for line in lines:
+            keys = [tuple(line[:n] + [x] + line[n:]) for x in xs]
+            worst = 0
+            for coef, coefTol in tol.items():
+                ys = [results[key][coef] for key in keys]
+                worst = max(worst, _midError(xs, ys, i) / coefTol)
+            if worst > 1:
+                newValues.append(xMid)
+                break
+    return newValues
+
+
+def adaptiveSweep(inputGeo, solveDeck, mach, alpha, psi=(0.,), hag=(0.,),
+                  tol=None, minStep=None, refine=None, maxPass=6,
+                  nProc=1):
+    """Adaptively sample the coefficients of inputGeo over the conditions.
+
+    mach, alpha, psi and hag are the coarse starting values of each axis
+    (psi deg, hag in; hag 0 = no ground effect, solved as its own
+    free-air decks but never refined toward). Starting heights must pass
+    vorModel.checkGroundHeights, and heights are not refined below the
+    lowest height it allows. tol maps each coefficient
+    to refine on to its absolute tolerance (default {'CL': 0.005,
+    'CM': 0.005}); minStep maps axes to the smallest spacing to refine to.
+    refine lists the axes to refine (default: those with 3 or more
+    starting values). Stops when no interval needs refining or after
+    maxPass passes.
+
+    Returns a dict with the final axis values (sorted lists, keyed by
+    AXES), 'results' mapping (mach, alpha, psi, hag) to the coefficient
+    dict, and 'nDecks', the number of decks solved.
+    """
+    if tol is None:
+        tol = {'CL': 0.005, 'CM': 0.005}
+    if minStep is None:
+        minStep = {'mach': 0.005, 'alpha': 0.1, 'psi': 0.1, 'hag': 1.}
+    grid = {}
+    for axis, values in zip(AXES, (mach, alpha, psi, hag)):
+        grid[axis] = sorted(set(round(v, DIGITS[axis]) for v in values))
+    if refine is None:
+        refine = [axis for axis in AXES if
+                  len([v for v in grid[axis] if axis != 'hag' or v > 0]) >= 3]
+    vorModel.checkGroundHeights(inputGeo, grid['hag'])
+    hagMin = vorModel.minGroundHeight(inputGeo) + vorModel.GROUND_CLEARANCE
+    results = {}
+    nDecks = 0
+    for iPass in range(maxPass + 1):
+        todo = [(m, a, p, h) for m in grid['mach'] for a in grid['alpha']
+                for p in grid['psi'] for h in grid['hag']
+                if (m, a, p, h) not in results]
+        batches = batchConditions(todo)
+        decks = [vorModel.vorlaxDeck(inputGeo, **conditions)
+                 for conditions in batches]
+        for conditions, solved in zip(batches,
+                                      solveDecks(decks, solveDeck, nProc)):
+            for m in conditions['mach']:
+                for a in conditions['alpha']:
+                    results[(m, a, conditions['psi'],
+                             conditions['hag'])] = solved[(m, a)]
+        nDecks += len(decks)
+        if iPass == maxPass:
+            break
+        # Every axis is checked on the solved grid before any is refined
+        newValues = {axis: _refineAxis(axis, grid, results, tol, minStep,
+                                       hagMin)
+                     for axis in refine}
+        if not any(newValues.values()):
+            break
+        for axis in refine:
+            grid[axis] = sorted(set(grid[axis] + newValues[axis]))
+    grid['results'] = results
+    grid['nDecks'] = nDecks
+    return grid
@@ -0,0 +1,286 @@
+'''
+VorSensitivity
+
+Batched finite-difference sensitivities of the VORLAX coefficients (e.g.
+CL, CM, CDI) with respect to inputGeo entries such as sweepIncrDegSta*,
+incidenceDegSta*, zShearInInSta* and ratioCSta*OverCtrap, for planform
+optimization.
+
+All perturbed designs of a base point are generated up front (forward or
+central differences, per parameter), written as decks holding every MACH
+and ALPHA card, and deduplicated by hashing the deck with its comment
+cards stripped: perturbations that only change comment cards (e.g.
+mrpMacHTailPct, which VORLAX never sees) cost no solve, and give a zero
+derivative. The unique decks are solved as one parallel batch and the
+Jacobian is assembled from the results.
+
+Steps: inputs in degrees (...Deg..., ...Angle) step 0.1 deg, lengths
+(...InIn...) 0.5 in and % MAC inputs 0.5 %; all others step RELATIVE_STEP
+times their value (at least RELATIVE_STEP). Override per parameter with
+steps={name: step}. Cards are written to a fixed resolution (0.001 in for
+coordinates, 0.00001 for tan(incidence)), so a step must change some card
+by at least 1 / RESOLUTION_TOL units of its last digit: default steps are
+doubled until they do (the steps used are returned), while a given step
+that leaves the cards unchanged or changes them too little raises
+ValueError rather than returning a zero or rounding-dominated derivative.
+
+Derivatives of derived geometry (chords, MAC, MRP, tail volume
+coefficients, see geometryDerivatives) are exact where the formula is
+simple, and central differences of vorModel.deriveGeometry otherwise.
+
+The solver is supplied by the caller, as for "vorSampling": a module
+level solveDeck(deckText) returning {(mach, alpha): {'CL': ..., ...}}.
+'''
+import hashlib
+
+import vorModel
+import vorSampling
+
+# Absolute steps for inputGeo names containing these; others are relative
+_absoluteSteps = (('Deg', 0.1), ('Angle', 0.1), ('InIn', 0.5), ('Pct', 0.5))
+RELATIVE_STEP = 1e-3
+# Largest allowed card rounding error relative to the card change
+RESOLUTION_TOL = 0.01
+# Step multiple probed to tell comment-only inputs from too small steps
+_PROBE_FACTOR = 100.
+# Most doublings of a default step to resolve it on the cards
+_MAX_GROWTH = 7
+# Derived geometry reported by default
+GEOMETRY = ('chordSta1InIn', 'chordSta2InIn', 'chordSta3InIn',
+            'chordSta4InIn', 'chordSta5InIn', 'chordSta6InIn', 'cMacInIn',
+            'xMrpInIn', 'hTailVolCoeff', 'vTailVolCoeff')
+
+
+def designParameters(inputGeo):
+    """Return the inputGeo entries that can be perturbed: all numeric
+    entries except the on/off switches."""
+    return [name for name, value in inputGeo.items()
+            if isinstance(value, (int, float)) and
+            not isinstance(value, bool) and not name.startswith('is')]
+
+
+def stepSize(inputGeo, parameter):
+    """Return the starting finite-difference step of parameter (see module
+    docstring). Cards are written to 0.001 in (0.00001 for
+    tan(incidence)), so sensitivities doubles a default step until the
+    rounding error of the cards it changes is within RESOLUTION_TOL, for
+    the difference method in use; given steps are never changed."""
+    for part, step in _absoluteSteps:
+        if part in parameter:
+            return step
+    return RELATIVE_STEP * max(abs(inputGeo[parameter]), 1.)
+
+
+def geometryHash(deck):
+    """Return a digest of deck with its comment cards (echo, labels)
+    stripped, identifying the geometry and conditions the solver sees."""
+    cards = [line for line in deck.splitlines() if not line.startswith('*')]
+    return hashlib.sha1('\n'.join(cards).encode('utf-8')).hexdigest()
+
+
+def _cardValues(deck):
+    # (value, resolution) of each number on the non-comment cards
+    values = []
+    for line in deck.splitlines():
+        if line.startswith('*'):
+            continue
+        for token in line.split():
+            try:
+                value = float(token)
+            except ValueError:
+                continue
+            decimals = len(token.split('.')[1]) if '.' in token else 0
+            values.append((value, 10.**-decimals))
+    return values
+
+
+def _roundingError(deckA, deckB):
+    # Card rounding error relative to the change between two decks, for
+    # the card that changed most in units of its last digit (None if the
+    # card layouts differ)
+    valuesA, valuesB = _cardValues(deckA), _cardValues(deckB)
+    if len(valuesA) != len(valuesB):
+        return None
+    changes = [abs(a - b) / res for (a, res), (b, _)
+               in zip(valuesA, valuesB) if a != b]
+    return 1 / max(changes) if changes else None
+
+
+def _perturbed(inputGeo, parameter, delta):
+    design = dict(inputGeo)
+    design[parameter] = inputGeo[parameter] + delta
+    return design
+
+
+def _stencilDecks(inputGeo, parameter, h, central, baseDeck, conditions):
+    # (plus, minus) decks of a central or forward difference
+    plusDeck = vorModel.vorlaxDeck(_perturbed(inputGeo, parameter, h),
+                                   **conditions)
+    if not central:
+        return plusDeck, baseDeck
+    return plusDeck, vorModel.vorlaxDeck(_perturbed(inputGeo, parameter, -h),
+                                         **conditions)
+
+
+def _analyticDerivatives(inputGeo, geo):
+    # {(quantity, parameter): exact derivative} where the formula is simple
+    derivs = {}
+    sFt2 = inputGeo['sRefInFt2']
+    ar = inputGeo['arWing']
+    cRoot, cTip, cMac = geo['cRootInIn'], geo['cTipInIn'], geo['cMacInIn']
+    # Chords scale with sqrt(S / AR): d c / d S = c / 2S, d c / d AR = -c / 2AR
+    for iSta in range(1, 7):
+        quantity = 'chordSta' + str(iSta) + 'InIn'
+        ratio = 'ratioCSta' + str(iSta) + 'OverCtrap'
+        if iSta < 6:
+            eta = inputGeo['bSta' + str(iSta) + 'OverHalfSpan']
+            derivs[(quantity, ratio)] = cRoot - eta * (cRoot - cTip)
+            derivs[(quantity, 'bSta' + str(iSta) + 'OverHalfSpan')] = \
+                -(cRoot - cTip) * inputGeo[ratio]
+        else:
+            derivs[(quantity, ratio)] = cTip
+        derivs[(quantity, 'sRefInFt2')] = geo[quantity] / (2 * sFt2)
+        derivs[(quantity, 'arWing')] = -geo[quantity] / (2 * ar)
+    derivs[('cMacInIn', 'sRefInFt2')] = cMac / (2 * sFt2)
+    derivs[('cMacInIn', 'arWing')] = -cMac / (2 * ar)
+    # MRP moves with the wing apex and cMac / 100 per % MAC
+    derivs[('xMrpInIn', 'xDistWingApexInIn')] = 1.
+    derivs[('xMrpInIn', 'mrpMacPct')] = cMac / 100
+    # Volume coefficients are linear in the tail arm
+    hScale = geo['sRefHTailInIn2'] / (cMac * geo['sRefInIn2'])
+    vScale = geo['sRefVTailInIn2'] / (geo['bInIn'] * geo['sRefInIn2'])
+    for quantity, scale, apex, pct, cMacTail in (
+            ('hTailVolCoeff', hScale, 'xDistHTailApexInIn', 'mrpMacHTailPct',
+             geo['cMacHTailInIn']),
+            ('vTailVolCoeff', vScale, 'xDistVTailBaseInIn', 'mrpMacVTailPct',
+             geo['cMacVTailInIn'])):
+        derivs[(quantity, apex)] = scale
+        derivs[(quantity, 'xDistWingApexInIn')] = -scale
+        derivs[(quantity, 'mrpMacPct')] = -scale * cMac / 100
+        derivs[(quantity, pct)] = scale * cMacTail / 100
+    return derivs
+
+
+def geometryDerivatives(inputGeo, parameters=None, quantities=GEOMETRY,
+                        steps=None):
+    """Return {quantity: [d quantity / d parameter for parameters]} for
+    vorModel.deriveGeometry quantities, exact where available (see
+    _analyticDerivatives), otherwise by central differences."""
+    if parameters is None:
+        parameters = designParameters(inputGeo)
+    steps = steps or {}
+    geo = vorModel.deriveGeometry(inputGeo)
+    exact = _analyticDerivatives(inputGeo, geo)
+    derivs = {quantity: [] for quantity in quantities}
+    differenced = {}
+    for parameter in parameters:
+        if any((quantity, parameter) not in exact
+               for quantity in quantities):
+            h = steps.get(parameter, stepSize(inputGeo, parameter))
+            differenced[parameter] = (
+                vorModel.deriveGeometry(_perturbed(inputGeo, parameter, h)),
+                vorModel.deriveGeometry(_perturbed(inputGeo, parameter, -h)),
+                h)
+        for quantity in quantities:
+            if (quantity, parameter) in exact:
+                derivs[quantity].append(exact[(quantity, parameter)])
+            else:
+                geoPlus, geoMinus, h = differenced[parameter]
+                derivs[quantity].append(
+                    (geoPlus[quantity] - geoMinus[quantity]) / (2 * h))
+    return derivs
+
+
+def sensitivities(inputGeo, solveDeck, alpha=(0.,), mach=(0.2,), psi=0.,
+                  hag=0., parameters=None, steps=None, method='central',
+                  coefficients=('CL', 'CM', 'CDI'), quantities=GEOMETRY,
+                  nProc=1):
+    """Return the Jacobian of the coefficients of inputGeo with respect to
+    parameters (default designParameters(inputGeo)) at every mach x alpha
+    condition (psi deg, hag in).
+
+    steps maps parameters to their step (default stepSize, doubled until
+    the cards resolve it); method is 'central' or 'forward', or a dict
+    mapping parameters to either. All unique perturbed decks are solved as
+    one batch over nProc processes.
+
+    Returns a dict with 'parameters', 'steps' (the steps used),
+    'conditions' (list of
+    (mach, alpha)), 'base' ({coef: [value per condition]}), 'jacobian'
+    ({coef: nested list [iCondition][iParameter]}), 'geometry' (see
+    geometryDerivatives) and 'nDecks', the number of decks solved.
+    """
+    if parameters is None:
+        parameters = designParameters(inputGeo)
+    given = dict(steps or {})
+    steps = {}
+    if not isinstance(method, dict):
+        method = {parameter: method for parameter in parameters}
+    conditions = {'mach': [round(m, vorSampling.DIGITS['mach'])
+                           for m in mach],
+                  'alpha': [round(a, vorSampling.DIGITS['alpha'])
+                            for a in alpha],
+                  'psi': psi, 'hag': hag}
+
+    # Perturbed decks, deduplicated by geometry hash
+    decks = []
+    deckIndex = {}
+
+    def addDeck(deck):
+        key = geometryHash(deck)
+        if key not in deckIndex:
+            deckIndex[key] = len(decks)
+            decks.append(deck)
+        return deckIndex[key]
+
+    baseDeck = vorModel.vorlaxDeck(inputGeo, **conditions)
+    iBase = addDeck(baseDeck)
+    stencils = []
+    for parameter in parameters:
+        central = method.get(parameter, 'central') == 'central'
+        h0 = given.get(parameter, stepSize(inputGeo, parameter))
+        # Default steps grow until the cards resolve them (see stepSize)
+        for iGrow in range(_MAX_GROWTH + 1):
+            h = h0 * 2**iGrow
+            plusDeck, minusDeck = _stencilDecks(inputGeo, parameter, h,
+                                                central, baseDeck, conditions)
+            unchanged = geometryHash(plusDeck) == geometryHash(minusDeck)
+            error = _roundingError(plusDeck, minusDeck)
+            if parameter in given or not unchanged and \
+               (error is None or error <= RESOLUTION_TOL):
+                break
+        if unchanged:
+            # Either the input only shows in comments (zero derivative), or
+            # the step is below the card resolution
+            h = h0
+            probe = vorModel.vorlaxDeck(
+                _perturbed(inputGeo, parameter, _PROBE_FACTOR * h),
+                **conditions)
+            if geometryHash(probe) != geometryHash(baseDeck):
+                raise ValueError('Step ' + str(h) + ' of ' + parameter +
+                                 ' is below the card resolution')
+        elif error is not None and error > RESOLUTION_TOL:
+            raise ValueError('Step ' + str(h) + ' of ' + parameter +
+                             ' is too close to the card resolution (' +
+                             "{:.1%}".format(error) +
+                             ' rounding error), use a larger step')
+        steps[parameter] = h
+        stencils.append((addDeck(plusDeck), addDeck(minusDeck),
+                         2 * h if central else h))
+    solved = vorSampling.solveDecks(decks, solveDeck, nProc)
+
+    keys = [(m, a) for m in conditions['mach'] for a in conditions['alpha']]
+    base = {coef: [solved[iBase][key][coef] for key in keys]
+            for coef in coefficients}
+    jacobian = {}
+    for coef in coefficients:
+        jacobian[coef] = [[(solved[iPlus][key][coef] -
+                            solved[iMinus][key][coef]) / span
+                           if iPlus != iMinus else 0.
+                           for iPlus, iMinus, span in stencils]
+                          for key in keys]
+    return {'parameters': list(parameters), 'steps': steps,
+            'conditions': keys, 'base': base, 'jacobian': jacobian,
+            'geometry': geometryDerivatives(inputGeo, parameters, quantities,
+                                            steps),
+            'nDecks': len(decks)}
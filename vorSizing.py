@@ -0,0 +1,244 @@
+'''
+VorSizing
+
+Inverse sizing for batches of VorModel designs: instead of computing the
+tail volume coefficients forward from the tail areas and locations, find
+the input that gives a target value for every design of a DOE at once.
+
+Targets (see designQuantity):
+hTailVolCoeff, vTailVolCoeff  tail volume coefficients (as in vorlax.in)
+xMrpInIn                      x of the moment reference point
+staticMargin                  static margin proxy, fraction of wing MAC
+
+Unknowns are inputGeo entries, e.g. xDistHTailApexInIn, sRefHTailInFt2,
+xDistVTailBaseInIn, sRefVTailInFt2 or mrpMacPct.
+
+Combinations where the target is linear in the unknown (tail apex/base
+location or mrpMacPct for a volume coefficient, static margin or MRP
+location) are solved in closed form. All others (e.g. tail areas, where
+the tail arm and the MAC grow with the square root of the area) use a
+batched Illinois (regula falsi) root finder that advances every design
+of the batch together until all have converged.
+
+E.g. move the horizontal tail of each design to get a volume coefficient
+of 1.0:
+sized = solveInverse(designs, 1.0, 'xDistHTailApexInIn', 'hTailVolCoeff')
+'''
+import copy
+import math
+
+import vorModel
+
+
+def liftSlope(ar, sweepQtrChordDeg):
+    """Return the low speed lift curve slope (per radian) of a planform,
+    from the Helmbold/DATCOM formula."""
+    tanSweep = math.tan(sweepQtrChordDeg * vorModel.degToRad)
+    return 2 * math.pi * ar / \
+           (2 + (ar**2 * (1 + tanSweep**2) + 4)**0.5)
+
+
+def staticMarginProxy(inputGeo, etaHTail=0.9, geo=None):
+    """Return a static margin proxy, as a fraction of the wing MAC.
+
+    Neutral point = wing aerodynamic center (25% MAC) + horizontal tail
+    contribution etaHTail * Vh * aHTail / aWing * (1 - dEps/dAlpha), with
+    the downwash gradient dEps/dAlpha = 2 * aWing / (pi * arWing). The
+    moment reference point (mrpMacPct) stands in for the CG.
+    """
+    if geo is None:
+        geo = vorModel.deriveGeometry(inputGeo)
+    hNeutralPoint = 0.25
+    if inputGeo['isHTailOn'] != 0:
+        hNeutralPoint += etaHTail * geo['hTailVolCoeff'] * \
+                         _tailSlopeFactor(inputGeo, geo)
+    return hNeutralPoint - inputGeo['mrpMacPct'] / 100
+
+
+def _tailSlopeFactor(inputGeo, geo):
+    # aHTail / aWing * (1 - dEps/dAlpha)
+    aWing = liftSlope(inputGeo['arWing'], geo['sweepQtrChordWingInDeg'])
+    aHTail = liftSlope(inputGeo['arHTail'],
+                       geo['sweepQtrChordHTailWingInDeg'])
+    return aHTail / aWing * (1 - 2 * aWing / (math.pi * inputGeo['arWing']))
+
+
+def designQuantity(inputGeo, target, etaHTail=0.9):
+    """Return the value of target (see module docstring) for inputGeo."""
+    geo = vorModel.deriveGeometry(inputGeo)
+    if target == 'staticMargin':
+        return staticMarginProxy(inputGeo, etaHTail, geo)
+    return geo[target]
+
+
+def _closedForm(inputGeo, targetValue, unknown, target, etaHTail):
+    # Return the unknown giving targetValue, or None if target is not
+    # linear in unknown
+    geo = vorModel.deriveGeometry(inputGeo)
+    # Volume coefficient as arm (in) times area ratio over reference length
+    hArmScale = geo['sRefHTailInIn2'] / (geo['cMacInIn'] * geo['sRefInIn2'])
+    vArmScale = geo['sRefVTailInIn2'] / (geo['bInIn'] * geo['sRefInIn2'])
+    if target == 'staticMargin' and unknown == 'xDistHTailApexInIn':
+        if inputGeo['isHTailOn'] == 0:
+            raise ValueError('Static margin proxy needs the horizontal tail')
+        # Static margin is linear in Vh, which is linear in the apex
+        targetValue = (targetValue - 0.25 + inputGeo['mrpMacPct'] / 100) / \
+                      (etaHTail * _tailSlopeFactor(inputGeo, geo))
+        target = 'hTailVolCoeff'
+    if target == 'hTailVolCoeff' and unknown == 'xDistHTailApexInIn':
+        return inputGeo['xDistHTailApexInIn'] + \
+               (geo['xMrpInIn'] + targetValue / hArmScale -
+                geo['xMrpHTailInIn'])
+    if target == 'vTailVolCoeff' and unknown == 'xDistVTailBaseInIn':
+        return inputGeo['xDistVTailBaseInIn'] + \
+               (geo['xMrpInIn'] + targetValue / vArmScale -
+                geo['xMrpVTailInIn'])
+    if unknown != 'mrpMacPct':
+        return None
+    # Moment reference point moves cMac / 100 per % MAC
+    if target == 'xMrpInIn':
+        xMrpInIn = targetValue
+    elif target == 'hTailVolCoeff':
+        xMrpInIn = geo['xMrpHTailInIn'] - targetValue / hArmScale
+    elif target == 'vTailVolCoeff':
+        xMrpInIn = geo['xMrpVTailInIn'] - targetValue / vArmScale
+    elif target == 'staticMargin':
+        # SM = 0.25 + k * Vh(pct) - pct / 100, with Vh linear in pct
+        k = 0
+        if inputGeo['isHTailOn'] != 0:
+            k = etaHTail * _tailSlopeFactor(inputGeo, geo)
+        vh0 = geo['hTailVolCoeff'] + \
+              inputGeo['mrpMacPct'] / 100 * geo['sRefHTailInIn2'] / \
+              geo['sRefInIn2']
+        return 100 * (0.25 + k * vh0 - targetValue) / \
+               (1 + k * geo['sRefHTailInIn2'] / geo['sRefInIn2'])
+    else:
+        return None
+    return 100 * (xMrpInIn - geo['xLeMacInIn']) / geo['cMacInIn']
+
+
+def _defaultBounds(inputGeo, unknown):
+    value = inputGeo[unknown]
+    if unknown.startswith('xDist'):
+        return value - inputGeo['lengthFuseInIn'], \
+               value + inputGeo['lengthFuseInIn']
+    if unknown.endswith('Pct'):
+        return -100., 200.
+    if value <= 0:
+        raise ValueError('No default bounds for ' + unknown + ' = ' +
+                         str(value) + ', give bounds')
+    # Areas, aspect ratios etc. scale
+    return 0.01 * value, 10 * value
+
+
+def batchRootFind(func, lo, hi, tol=1e-10, maxIter=100):
+    """Solve func(index, xs)[k] = 0 for every problem, with the root of
+    problem i bracketed by [lo[i], hi[i]].
+
+    func is called with the list of still unconverged problem indices and
+    their current estimates xs, so each iteration is one batched
+    evaluation. Uses the Illinois variant of regula falsi. Returns the
+    list of roots.
+    """
+    n = len(lo)
+    lo, hi = list(lo), list(hi)
+    allIndex = list(range(n))
+    fLo, fHi = func(allIndex, lo), func(allIndex, hi)
+    roots = [None] * n
+    side = [0] * n
+    active = []
+    for i in allIndex:
+        if fLo[i] * fHi[i] > 0:
+            raise ValueError('Root not bracketed for design ' + str(i) +
+                             ': [' + str(lo[i]) + ', ' + str(hi[i]) + ']')
+        if fLo[i] == 0 or fHi[i] == 0:
+            roots[i] = lo[i] if fLo[i] == 0 else hi[i]
+        else:
+            active.append(i)
+    for iteration in range(maxIter):
+        if not active:
+            return roots
+        xs = [(lo[i] * fHi[i] - hi[i] * fLo[i]) / (fHi[i] - fLo[i])
+              for i in active]
+        fs = func(active, xs)
+        stillActive = []
+        for i, x, f in zip(active, xs, fs):
+            if f * fHi[i] > 0:
+                hi[i], fHi[i] = x, f
+                # Halve the stale end to keep convergence superlinear
+                if side[i] == 1:
+                    fLo[i] /= 2
+                side[i] = 1
+            else:
+                lo[i], fLo[i] = x, f
+                if side[i] == -1:
+                    fHi[i] /= 2
+                side[i] = -1
+            if abs(f) <= tol or abs(hi[i] - lo[i]) <= tol * (1 + abs(x)):
+                roots[i] = x
+            else:
+                stillActive.append(i)
+        active = stillActive
+    if active:
+        raise ValueError('No convergence for designs ' + str(active))
+    return roots
+
+
+def solveInverse(designs, targetValues, unknown, target, bounds=None,
+                 etaHTail=0.9, tol=1e-10):
+    """Return copies of designs (inputGeo dicts) with unknown set so that
+    target equals targetValues (one per design, or a single value).
+
+    bounds, a (lo, hi) pair or a list of them (one per design), bracket
+    the unknown for combinations solved by root finding; by default
+    locations (xDist...) move by up to the fuselage length and positive
+    inputs such as areas range from 0.01 to 10 times their current value.
+    """
+    if not isinstance(targetValues, (list, tuple)):
+        targetValues = [targetValues] * len(designs)
+    sized = [copy.deepcopy(inputGeo) for inputGeo in designs]
+    unsolved = []
+    for i, inputGeo in enumerate(sized):
+        value = _closedForm(inputGeo, targetValues[i], unknown, target,
+                            etaHTail)
+        if value is None:
+            unsolved.append(i)
+        else:
+            inputGeo[unknown] = value
+    if not unsolved:
+        return sized
+    if bounds is None:
+        bounds = [_defaultBounds(sized[i], unknown) for i in unsolved]
+    elif not isinstance(bounds[0], (list, tuple)):
+        bounds = [bounds] * len(unsolved)
+    else:
+        bounds = [bounds[i] for i in unsolved]
+
+    def residuals(index, xs):
+        out = []
+        for k, x in zip(index, xs):
+            trial = dict(sized[unsolved[k]])
+            trial[unknown] = x
+            out.append(designQuantity(trial, target, etaHTail) -
+                       targetValues[unsolved[k]])
+        return out
+
+    roots = batchRootFind(residuals, [b[0] for b in bounds],
+                          [b[1] for b in bounds], tol)
+    for i, root in zip(unsolved, roots):
+        sized[i][unknown] = root
+    return sized
+
+
+if __name__ == '__main__':
+    # Size the tails of the vorModel design for its current volume
+    # coefficients plus 10%
+    geo = vorModel.deriveGeometry(vorModel.inputGeo)
+    for unknown, target in (('xDistHTailApexInIn', 'hTailVolCoeff'),
+                            ('sRefHTailInFt2', 'hTailVolCoeff'),
+                            ('xDistVTailBaseInIn', 'vTailVolCoeff'),
+                            ('sRefVTailInFt2', 'vTailVolCoeff')):
+        sized = solveInverse([vorModel.inputGeo], 1.1 * geo[target],
+                             unknown, target)[0]
+        print(unknown + ': ' + "{:10.3f}".format(vorModel.inputGeo[unknown]) +
+              ' -> ' + "{:10.3f}".format(sized[unknown]))